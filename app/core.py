@@ -1,6 +1,6 @@
-import numpy as np
 import pandas as pd
 
+from src.categories import RISK_BAND_DTYPE, risk_band_codes
 from src.config import SAVE_RATE
 from src.decision.retention_strategy import (
     apply_decision_strategy,
@@ -8,11 +8,13 @@ from src.decision.retention_strategy import (
     build_retention_scores,
     select_customers_under_budget,
 )
+from src.economics import offer_cost
 from src.features.feature_builder import FEATURES, build_feature_table
-from src.models.train_logistic import load_model
+from src.models.train_logistic import load_model, load_or_compile_model, predict_compiled
 
 # Model is loaded once and reused (joblib load is cheap but not free per call).
 _MODEL = None
+_COMPILED = None
 
 
 def _get_model():
@@ -22,6 +24,15 @@ def _get_model():
     return _MODEL
 
 
+def _get_compiled():
+    """The model flattened for numpy scoring: the pipeline's exported
+    artifact, or the loaded model compiled once if there is none."""
+    global _COMPILED
+    if _COMPILED is None:
+        _COMPILED = load_or_compile_model()
+    return _COMPILED
+
+
 # --------------------------------------------------
 # Risk band assignment (operational, not statistical)
 # --------------------------------------------------
@@ -41,12 +52,12 @@ def assign_risk_band(churn_prob: float) -> str:
 def score_customers() -> pd.DataFrame:
     df = build_feature_table()
 
-    probs = _get_model().predict_proba(df[FEATURES])[:, 1]
+    probs = predict_compiled(_get_compiled(), df)
     df["churn_probability"] = probs
 
-    # Risk bands (vectorized)
-    df["risk_band"] = np.select(
-        [probs >= 0.60, probs >= 0.30], ["HIGH", "MEDIUM"], default="LOW"
+    # Risk bands (vectorized, stored as codes into the shared LOW/MEDIUM/HIGH dictionary)
+    df["risk_band"] = pd.Categorical.from_codes(
+        risk_band_codes(probs), dtype=RISK_BAND_DTYPE
     )
 
     # Diagnostic expected loss (vectorized)
@@ -56,6 +67,19 @@ def score_customers() -> pd.DataFrame:
     return df
 
 
+def reprice_scored(scored: pd.DataFrame, **offer) -> pd.DataFrame:
+    """A scored table with retention costs recomputed for new offer parameters.
+
+    `offer` takes `offer_cost`'s outreach_cost / discount_rate / offer_months
+    (config values by default). Only retention_cost and loss_if_act change;
+    the churn model is not re-run.
+    """
+    df = scored.copy()
+    df["retention_cost"] = offer_cost(df, **offer)
+    df["loss_if_act"] = (1 - df["churn_probability"]) * df["retention_cost"]
+    return df
+
+
 # --------------------------------------------------
 # Decision explainability helpers (run on the small ACT subset only)
 # --------------------------------------------------
@@ -0,0 +1,236 @@
+"""Chunked batch scoring of the customers table into a SQLite `scores` table.
+
+`app.core.score_customers` materializes the whole feature table and scores
+it in one call: fine for the dashboard, unbounded for a 50M-customer book.
+Here the customers table is split into rowid ranges of SCORING_CHUNK_ROWS;
+each range is read with a projected, typed query, scored with the compiled
+numpy kernel (`train_logistic.predict_compiled`) and reduced to
+(customer_id, churn_probability, risk_band) before the next one is read.
+Peak memory is one chunk per worker plus the chunks in flight, independent
+of the table size.
+
+Ranges are scored across a process pool (each worker opens its own
+read-only connection), while the parent is the single SQLite writer. Scores
+go to a fresh table that replaces `scores` in one transaction, so readers
+never see a half-written scoring run.
+
+Benchmark against in-memory scoring:  python -m src.batch_scoring --benchmark
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.categories import RISK_BAND_DTYPE, risk_band_codes
+from src.config import DB_PATH, SCORING_CHUNK_ROWS, SCORING_WORKERS
+from src.features.feature_builder import FEATURE_DTYPES, FEATURES
+from src.logging_config import get_logger
+from src.models.train_logistic import load_or_compile_model, predict_compiled
+
+log = get_logger("scoring")
+
+SCORES_TABLE = "scores"
+
+# The compiled model, installed once per worker process.
+_COMPILED = None
+
+
+def _init_worker(compiled: dict) -> None:
+    global _COMPILED
+    _COMPILED = compiled
+
+
+def _rowid_ranges(conn: sqlite3.Connection, chunk_rows: int) -> list[tuple[int, int]]:
+    """Half-open (lo, hi] rowid ranges of about `chunk_rows` customers each."""
+    lo, hi = conn.execute("SELECT MIN(rowid) - 1, MAX(rowid) FROM customers").fetchone()
+    if hi is None:
+        return []
+    bounds = list(range(lo, hi, chunk_rows)) + [hi]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _score_range(db_path: Path, lo: int, hi: int):
+    """Read and score one rowid range: (customer_ids, probabilities)."""
+    columns = ["customer_id"] + FEATURES
+    select = ", ".join(f'"{c}"' for c in columns)
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    with sqlite3.connect(uri, uri=True) as conn:
+        chunk = pd.read_sql_query(
+            f"SELECT {select} FROM customers WHERE rowid > ? AND rowid <= ?",
+            conn, params=(lo, hi), dtype={c: FEATURE_DTYPES[c] for c in columns},
+        )
+    return chunk["customer_id"].tolist(), predict_compiled(_COMPILED, chunk)
+
+
+def _score_task(args):
+    return _score_range(*args)
+
+
+def _scored_chunks(db_path: Path, ranges: list, max_workers: int | None):
+    """Scored ranges in order, at most ~2 per worker in flight at a time."""
+    tasks = [(db_path, lo, hi) for lo, hi in ranges]
+    if max_workers == 1 or len(tasks) <= 1:
+        yield from map(_score_task, tasks)
+        return
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(_COMPILED,)
+    ) as pool:
+        pending = [pool.submit(_score_task, t) for t in tasks[:window]]
+        for t in tasks[window:] + [None] * window:
+            if not pending:
+                break
+            yield pending.pop(0).result()
+            if t is not None:
+                pending.append(pool.submit(_score_task, t))
+
+
+def score_to_sqlite(
+    db_path: Path = DB_PATH,
+    chunk_rows: int = SCORING_CHUNK_ROWS,
+    max_workers: int | None = SCORING_WORKERS,
+    compiled: dict | None = None,
+) -> dict:
+    """Score every customer into the `scores` table, chunk by chunk.
+
+    `compiled` defaults to the exported compiled model (the saved pipeline,
+    compiled, if the export is missing or stale). Writes
+    (customer_id, churn_probability, risk_band) and returns the row and
+    chunk counts and the elapsed seconds.
+    """
+    t0 = time.perf_counter()
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(
+            f"Database not found at {db_path} — run `python -m src.pipeline` first."
+        )
+    _init_worker(compiled if compiled is not None else load_or_compile_model())
+    bands = np.asarray(RISK_BAND_DTYPE.categories, dtype=object)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        ranges = _rowid_ranges(conn, chunk_rows)
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS {SCORES_TABLE}_new")
+            conn.execute(
+                f"CREATE TABLE {SCORES_TABLE}_new (customer_id TEXT NOT NULL, "
+                "churn_probability REAL NOT NULL, risk_band TEXT NOT NULL)"
+            )
+            rows = 0
+            for ids, probs in _scored_chunks(db_path, ranges, max_workers):
+                conn.executemany(
+                    f"INSERT INTO {SCORES_TABLE}_new VALUES (?, ?, ?)",
+                    zip(ids, probs.tolist(), bands[risk_band_codes(probs)].tolist()),
+                )
+                rows += len(ids)
+            conn.execute(f"DROP TABLE IF EXISTS {SCORES_TABLE}")
+            conn.execute(f"ALTER TABLE {SCORES_TABLE}_new RENAME TO {SCORES_TABLE}")
+            conn.execute(
+                f"CREATE UNIQUE INDEX idx_{SCORES_TABLE}_customer_id "
+                f"ON {SCORES_TABLE}(customer_id)"
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    seconds = time.perf_counter() - t0
+    log.info(
+        "Scored %d customers in %d chunks into %s.%s (%.1fs)",
+        rows, len(ranges), db_path.name, SCORES_TABLE, seconds,
+    )
+    return {"rows": rows, "chunks": len(ranges), "seconds": seconds}
+
+
+def load_scores(db_path: Path = DB_PATH) -> pd.DataFrame:
+    """The `scores` table, with risk_band in the shared LOW/MEDIUM/HIGH dtype."""
+    with sqlite3.connect(Path(db_path)) as conn:
+        scores = pd.read_sql_query(f"SELECT * FROM {SCORES_TABLE}", conn)
+    scores["risk_band"] = scores["risk_band"].astype(RISK_BAND_DTYPE)
+    return scores
+
+
+def _benchmark(rows: int, chunk_rows: int, max_workers: int | None) -> pd.DataFrame:
+    """In-memory `score_customers`-style scoring vs. chunked scoring to SQLite.
+
+    The Telco table is tiled (with suffixed ids) up to `rows` customers and
+    bulk-loaded into a temporary database; peak RSS growth is reported for
+    each path, measured in a fresh child process.
+    """
+    from src.customer_cache import load_customers
+    from src.load_to_sqlite import load_to_sqlite
+
+    base = load_customers()
+    reps = -(-rows // len(base))
+    tiled = pd.concat([base] * reps, ignore_index=True).head(rows)
+    tiled["customer_id"] = tiled["customer_id"] + "-" + (
+        (np.arange(len(tiled)) // len(base)).astype(str)
+    )
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        load_to_sqlite(tiled, db_path, mode="bulk")
+        del tiled
+        for label, run in (("in-memory", _in_memory), ("chunked", score_to_sqlite)):
+            with ProcessPoolExecutor(max_workers=1) as isolated:
+                seconds, peak_mb = isolated.submit(
+                    _measure, run, db_path, chunk_rows, max_workers
+                ).result()
+            results.append({
+                "path": label, "rows": rows, "seconds": round(seconds, 2),
+                "peak_rss_mb": round(peak_mb, 1),
+            })
+    return pd.DataFrame(results)
+
+
+def _in_memory(db_path, chunk_rows, max_workers):
+    """What `score_customers` does: the whole feature table, scored at once."""
+    from src.features.feature_builder import build_feature_table
+
+    df = build_feature_table(db_path)
+    df["churn_probability"] = predict_compiled(load_or_compile_model(), df)
+    df["risk_band"] = pd.Categorical.from_codes(
+        risk_band_codes(df["churn_probability"].to_numpy()), dtype=RISK_BAND_DTYPE
+    )
+    return len(df)
+
+
+def _measure(run, db_path, chunk_rows, max_workers):
+    import resource
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    run(db_path, chunk_rows, max_workers)
+    seconds = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, (peak - before) / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch-score customers into SQLite.")
+    parser.add_argument("--chunk-rows", type=int, default=SCORING_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=SCORING_WORKERS)
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="Compare in-memory and chunked scoring on a tiled table.",
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(_benchmark(args.rows, args.chunk_rows, args.workers).to_string(index=False))
+    else:
+        score_to_sqlite(chunk_rows=args.chunk_rows, max_workers=args.workers)
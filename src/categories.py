@@ -0,0 +1,130 @@
+"""Compact categorical schema for the customer frame, with shared dictionaries.
+
+The Telco frame carries fifteen low-cardinality string columns (Yes/No flags,
+Contract, PaymentMethod, ...) plus the derived `plan`, `risk_band` and
+`action_segment`. As Python-object strings they dominate RSS; as pandas
+`category` they are one int8 code per row plus a tiny dictionary. The
+dictionaries are declared here once and shared by every stage (ingest,
+economics, SQLite reads, scoring, decisions), so codes mean the same thing
+everywhere. Domains are listed in sorted order — the order pandas would infer
+— so one-hot encodings and dummy columns are unchanged.
+
+Values outside a declared domain are appended (sorted) rather than dropped:
+compaction never loses data.
+
+Memory report per stage:  python -m src.categories
+"""
+
+import numpy as np
+import pandas as pd
+
+_YES_NO = ["No", "Yes"]
+_INTERNET_ADDON = ["No", "No internet service", "Yes"]
+_CONTRACTS = ["Month-to-month", "One year", "Two year"]
+
+CATEGORY_DOMAINS = {
+    "gender": ["Female", "Male"],
+    "Partner": _YES_NO,
+    "Dependents": _YES_NO,
+    "PhoneService": _YES_NO,
+    "MultipleLines": ["No", "No phone service", "Yes"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": _INTERNET_ADDON,
+    "OnlineBackup": _INTERNET_ADDON,
+    "DeviceProtection": _INTERNET_ADDON,
+    "TechSupport": _INTERNET_ADDON,
+    "StreamingTV": _INTERNET_ADDON,
+    "StreamingMovies": _INTERNET_ADDON,
+    "Contract": _CONTRACTS,
+    "plan": _CONTRACTS,
+    "PaperlessBilling": _YES_NO,
+    "PaymentMethod": [
+        "Bank transfer (automatic)", "Credit card (automatic)",
+        "Electronic check", "Mailed check",
+    ],
+}
+
+# 0/1 columns kept as small integers rather than categories.
+SMALL_INT_COLUMNS = {"SeniorCitizen": "int8", "churned": "int8"}
+
+RISK_BAND_DTYPE = pd.CategoricalDtype(["LOW", "MEDIUM", "HIGH"])
+ACTION_SEGMENT_DTYPE = pd.CategoricalDtype(["ACT", "MONITOR", "IGNORE"])
+
+
+def risk_band_codes(probs: np.ndarray) -> np.ndarray:
+    """Codes into RISK_BAND_DTYPE: HIGH at >= 0.60, MEDIUM at >= 0.30."""
+    return np.select([probs >= 0.60, probs >= 0.30], [2, 1], default=0).astype(np.int8)
+
+
+def shared_dtype(col: str, values: pd.Series | None = None) -> pd.CategoricalDtype:
+    """The shared dictionary for `col`, extended by any unseen `values`."""
+    domain = CATEGORY_DOMAINS[col]
+    if values is None:
+        return pd.CategoricalDtype(domain)
+    observed = values.cat.categories if isinstance(
+        values.dtype, pd.CategoricalDtype
+    ) else values.dropna().unique()
+    extra = sorted(set(observed) - set(domain))
+    return pd.CategoricalDtype(domain + extra)
+
+
+def compact_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """Recode known string columns to shared categories and 0/1 flags to int8."""
+    df = df.copy()
+    for col in CATEGORY_DOMAINS.keys() & set(df.columns):
+        dtype = shared_dtype(col, df[col])
+        if df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    for col, dtype in SMALL_INT_COLUMNS.items():
+        if col in df.columns and df[col].notna().all():
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def decode_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """The same frame with categories expanded back to object strings."""
+    cats = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: object for c in cats})
+
+
+def memory_report(stages: dict) -> pd.DataFrame:
+    """Deep memory per stage: object-string layout vs. the compact layout."""
+    rows = []
+    for stage, df in stages.items():
+        compact = df.memory_usage(deep=True).sum()
+        as_objects = decode_categoricals(df).memory_usage(deep=True).sum()
+        rows.append({
+            "stage": stage,
+            "rows": len(df),
+            "object_mb": round(as_objects / 2**20, 2),
+            "compact_mb": round(compact / 2**20, 2),
+            "reduction": round(float(as_objects / compact), 2) if compact else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+
+def _demo():
+    """Memory of the customer frame at each stage, object vs. compact."""
+    from app.core import decide, score_customers
+    from src.config import RAW_DATA_PATH
+    from src.economics import add_economic_fields
+    from src.features.feature_builder import build_feature_table
+    from src.ingest import load_clean_telco_data
+
+    cleaned = load_clean_telco_data(RAW_DATA_PATH)
+    enriched = add_economic_fields(cleaned)
+    scored = score_customers()
+    decided, _, _, _ = decide(scored, 25_000, 300, "Balanced")
+    report = memory_report({
+        "ingest": cleaned,
+        "economics": enriched,
+        "sqlite feature table": build_feature_table(),
+        "scored": scored,
+        "decided": decided,
+    })
+    print("[categories] deep memory per stage (object strings vs. shared categories):")
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    _demo()
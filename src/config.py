@@ -8,12 +8,51 @@ RAW_DATA_PATH = BASE_DIR / "data" / "raw" / "telco_churn.csv"
 DB_PATH = BASE_DIR / "data" / "db" / "retention.db"
 MODEL_PATH = BASE_DIR / "data" / "models" / "churn_model.joblib"
 METRICS_PATH = BASE_DIR / "data" / "models" / "metrics.json"
+# The churn model compiled to flat numpy arrays (see train_logistic.compile_model),
+# exported next to it for scoring without sklearn.
+COMPILED_MODEL_PATH = BASE_DIR / "data" / "models" / "churn_model_compiled.joblib"
+# Fitted Cox survival model (coefficients + baseline hazard), scored in numpy.
+# Refit only when missing, when the covariates change, or on covariate drift.
+SURVIVAL_MODEL_PATH = BASE_DIR / "data" / "models" / "cox_survival.joblib"
+# SQLite load mode: "upsert" applies only the delta (inserted / changed /
+# deleted customers) keyed on customer_id; "replace" rewrites the table.
+SQLITE_LOAD_MODE = "upsert"
+# Bulk-load pragmas: page cache and memory-mapped I/O sizes (MiB).
+SQLITE_CACHE_MB = 256
+SQLITE_MMAP_MB = 1024
+# Columnar cache of the cleaned, economics-enriched customer table.
+CACHE_DIR = BASE_DIR / "data" / "cache"
 
 TELCO_URL = (
     "https://raw.githubusercontent.com/IBM/telco-customer-churn-on-icp4d/"
     "master/data/Telco-Customer-Churn.csv"
 )
 
+# Streaming ingest: rows per CSV chunk when cleaning the raw extract. Bounds
+# peak memory of parsing + validation independently of the file size.
+INGEST_CHUNK_ROWS = 250_000
+# Worker processes for partitioned (multi-file) ingest; None = all cores.
+INGEST_WORKERS = None
+
+# Batch scoring into the SQLite `scores` table: customers per chunk (bounds
+# peak memory per worker) and worker processes (None = all cores).
+SCORING_CHUNK_ROWS = 200_000
+SCORING_WORKERS = None
+# Worker processes for the cross-validated LR-vs-GBM bake-off; None = all cores.
+BAKEOFF_WORKERS = None
+
+# Cleaned-frame validation: "fast" runs the data-quality checks as vectorized
+# numpy/pandas ops; "strict" runs the full pandera schema (slower, heavier
+# import). Both enforce the same rules with the same error messages.
+VALIDATION_MODE = "fast"
+
+# Downloaded-file manifest: SHA-256, ETag and Last-Modified per raw file, used
+# for integrity checks, resumable and conditional re-downloads (src/fetch.py).
+DOWNLOAD_MANIFEST_PATH = BASE_DIR / "data" / "raw" / "manifest.json"
+# Optional pinned checksums; None trusts the first download and records it.
+TELCO_SHA256 = None
+HILLSTROM_SHA256 = None
+
 # Hillstrom email A/B-test dataset (has treatment/control) for uplift modeling.
 HILLSTROM_PATH = BASE_DIR / "data" / "raw" / "hillstrom.csv"
 HILLSTROM_URL = (
@@ -32,7 +71,18 @@ CLV_HORIZON_MONTHS = 60
 # CLV survival method: "cox" (per-customer Cox proportional-hazards, uses all
 # covariates) or "km" (per-contract Kaplan-Meier). Cox is the richer model;
 # economics falls back to KM if Cox is unavailable or the sample is too small.
+# "cox_native" fits the same Cox model with the in-project numpy solver
+# (src.survival.cox_ph_fit) instead of lifelines — use it for large tables.
+# "discrete" fits a logistic monthly-hazard model on aggregated (pattern,
+# month) counts (src.discrete_survival) — individualized like Cox, cheaper.
 CLV_METHOD = "cox"
+# Customers per block when evaluating Cox survival curves; bounds peak memory
+# at roughly COX_CHUNK_SIZE x (max tenure + horizon) float64s.
+COX_CHUNK_SIZE = 50_000
+# Optional {numeric covariate: bin width} for Cox scoring. Customers sharing a
+# covariate pattern share one survival curve; binning numerics makes patterns
+# repeat more (fewer curves) at a small cost in precision. None scores exactly.
+COX_NUMERIC_BINS = None
 COX_NUMERIC_COVARIATES = ["MonthlyCharges", "TotalCharges"]
 COX_CATEGORICAL_COVARIATES = [
     "Contract", "InternetService", "PaymentMethod",
@@ -0,0 +1,229 @@
+"""Content-addressed columnar cache of the cleaned, economics-enriched table.
+
+Parsing + validating the raw CSV and fitting the survival model inside
+`add_economic_fields` are the expensive steps of every pipeline run, yet their
+output only changes when the raw file or the economic assumptions change. The
+table is cached in independent layers, each keyed by a SHA-256 over its parent
+layer's key and only the config it depends on:
+
+    clean      raw file bytes
+    remaining  clean + survival config (method, covariates, horizon)
+    clv        remaining
+    cost       clean + offer config (DISCOUNT_RATE, OFFER_MONTHS, OUTREACH_COST)
+
+so changing an offer parameter recomputes only the cost column — no parsing,
+no survival fit — and a warm run memory-maps every layer back in. Each layer
+is stored as one `.npy` file per column plus a small JSON manifest, which
+also carries the table's (JSON-able) `attrs` — e.g. the KM curves and fit
+metadata of the remaining-life layer.
+
+Categorical columns are stored as their integer codes with the dictionary in
+the manifest; other strings as fixed-width unicode arrays (no pickling), so
+the cache is plain numpy on disk and safe to load.
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import config
+from src.logging_config import get_logger
+
+log = get_logger("cache")
+
+# Bump when the cleaning/economics code changes what ends up in the table.
+_CACHE_VERSION = 4
+_MANIFEST = "manifest.json"
+
+# The config values each economic layer depends on (beyond its parent layer).
+SURVIVAL_KEYS = [
+    "CLV_HORIZON_MONTHS", "CLV_METHOD", "COX_NUMERIC_COVARIATES",
+    "COX_CATEGORICAL_COVARIATES", "COX_NUMERIC_BINS",
+]
+OFFER_KEYS = ["DISCOUNT_RATE", "OFFER_MONTHS", "OUTREACH_COST"]
+
+
+def cache_key(raw_path: Path, chunk_bytes: int = 1 << 20) -> str:
+    """SHA-256 of the raw file contents + cache version (the clean layer)."""
+    h = hashlib.sha256()
+    with open(raw_path, "rb") as fh:
+        while block := fh.read(chunk_bytes):
+            h.update(block)
+    h.update(f"v{_CACHE_VERSION}".encode())
+    return h.hexdigest()
+
+
+def layer_key(parent_key: str, config_keys: list[str]) -> str:
+    """SHA-256 of a parent layer's key + the config values this layer reads."""
+    values = {k: getattr(config, k) for k in config_keys}
+    h = hashlib.sha256(parent_key.encode())
+    h.update(json.dumps(values, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def save_table(df: pd.DataFrame, key: str, cache_dir: Path = config.CACHE_DIR) -> Path:
+    """Write `df` as one .npy per column under `cache_dir/key`, atomically.
+
+    Older entries are pruned: only the table for the current inputs is useful.
+    """
+    cache_dir = Path(cache_dir)
+    final = cache_dir / key
+    tmp = cache_dir / f".{key}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {"name": col, "file": f"{i}.npy", "dtype": str(values.dtype)}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry["categories"] = values.cat.categories.tolist()
+            np.save(tmp / entry["file"], values.cat.codes.to_numpy())
+        elif values.dtype == object:
+            mask = values.isna().to_numpy()
+            if mask.any():
+                np.save(tmp / f"{i}.mask.npy", mask)
+                entry["mask"] = f"{i}.mask.npy"
+            np.save(tmp / entry["file"], values.fillna("").astype(str).to_numpy(dtype=str))
+        else:
+            np.save(tmp / entry["file"], values.to_numpy())
+        columns.append(entry)
+
+    (tmp / _MANIFEST).write_text(json.dumps(
+        {"rows": len(df), "columns": columns, "attrs": df.attrs}
+    ))
+    for stale in cache_dir.iterdir():
+        if stale.is_dir() and stale != tmp:
+            shutil.rmtree(stale, ignore_errors=True)
+    tmp.replace(final)
+    return final
+
+
+def load_table(key: str, cache_dir: Path = config.CACHE_DIR) -> pd.DataFrame | None:
+    """The cached table for `key`, or None on a miss."""
+    entry_dir = Path(cache_dir) / key
+    manifest_path = entry_dir / _MANIFEST
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(entry_dir / entry["file"], mmap_mode="r")
+        if "categories" in entry:
+            col = pd.Series(pd.Categorical.from_codes(
+                np.asarray(values), categories=entry["categories"]
+            ))
+        elif entry["dtype"] == "object":
+            col = pd.Series(values, dtype=object)
+            if "mask" in entry:
+                col[np.load(entry_dir / entry["mask"])] = None
+        else:
+            col = pd.Series(np.asarray(values), dtype=entry["dtype"])
+        data[entry["name"]] = col
+    table = pd.DataFrame(data)
+    table.attrs = manifest.get("attrs", {})
+    return table
+
+
+def _prune_flat_entries(cache_dir: Path) -> None:
+    """Remove whole-table entries left at the top of `cache_dir` by the
+    single-table layout (layer directories hold no manifest of their own)."""
+    if not cache_dir.is_dir():
+        return
+    for entry in cache_dir.iterdir():
+        if entry.is_dir() and (
+            (entry / _MANIFEST).exists() or entry.name.endswith(".tmp")
+        ):
+            shutil.rmtree(entry, ignore_errors=True)
+            log.info("Pruned pre-layer cache entry %s", entry.name[:12])
+
+
+def _layer(name, key, compute, cache_dir, use_cache, refresh=False) -> pd.DataFrame:
+    """One cache layer: served from `cache_dir/name` on a hit, else computed."""
+    layer_dir = Path(cache_dir) / name
+    if use_cache and not refresh:
+        cached = load_table(key, layer_dir)
+        if cached is not None:
+            log.info("Cache hit: %s layer (%s)", name, key[:12])
+            return cached
+    table = compute()
+    if use_cache:
+        _prune_flat_entries(Path(cache_dir))
+        save_table(table, key, layer_dir)
+        log.info("Cached %s layer (%s)", name, key[:12])
+    return table
+
+
+def load_customers_and_survival(
+    raw_path: Path = config.RAW_DATA_PATH,
+    cache_dir: Path = config.CACHE_DIR,
+    use_cache: bool = True,
+    refit_survival: bool = False,
+    survival_path: Path = config.SURVIVAL_MODEL_PATH,
+):
+    """Cleaned + economics-enriched customers and this run's SurvivalResults.
+
+    Only layers whose inputs changed are recomputed. On a remaining-life miss
+    the survival estimates are computed once (`economics.survival_results`,
+    scoring the persisted artifact, which is refitted only when missing,
+    stale, drifted, or `refit_survival` is set — that also bypasses the
+    remaining-life and CLV cache reads); on a hit they are read back, curves
+    and fit metadata included. The artifact is read from (and saved to)
+    `survival_path`.
+    """
+    from src.economics import (
+        SurvivalResults,
+        attach_economic_fields,
+        load_or_fit_survival_artifact,
+        offer_cost,
+        survival_results,
+    )
+    from src.ingest import load_clean_telco_data
+
+    clean_key = cache_key(raw_path)
+    cleaned = _layer(
+        "clean", clean_key, lambda: load_clean_telco_data(raw_path), cache_dir, use_cache
+    )
+
+    def remaining_months():
+        artifact = load_or_fit_survival_artifact(
+            cleaned, survival_path, refit=refit_survival
+        )
+        return survival_results(cleaned, survival_artifact=artifact).to_frame()
+
+    remaining_key = layer_key(clean_key, SURVIVAL_KEYS)
+    survival = SurvivalResults.from_frame(_layer(
+        "remaining", remaining_key, remaining_months, cache_dir, use_cache, refit_survival
+    ), index=cleaned.index)
+    remaining = survival.remaining.to_numpy()
+    clv = _layer(
+        "clv", layer_key(remaining_key, []),
+        lambda: pd.DataFrame({"CLV": cleaned["MonthlyCharges"].to_numpy() * remaining}),
+        cache_dir, use_cache, refit_survival,
+    )["CLV"]
+    cost = _layer(
+        "cost", layer_key(clean_key, OFFER_KEYS),
+        lambda: pd.DataFrame({"retention_cost": offer_cost(
+            cleaned, config.OUTREACH_COST, config.DISCOUNT_RATE, config.OFFER_MONTHS
+        ).to_numpy()}),
+        cache_dir, use_cache,
+    )["retention_cost"]
+    return attach_economic_fields(cleaned, clv, cost), survival
+
+
+def load_customers(
+    raw_path: Path = config.RAW_DATA_PATH,
+    cache_dir: Path = config.CACHE_DIR,
+    use_cache: bool = True,
+    refit_survival: bool = False,
+    survival_path: Path = config.SURVIVAL_MODEL_PATH,
+) -> pd.DataFrame:
+    """Cleaned + economics-enriched customers, served layer by layer from cache."""
+    return load_customers_and_survival(
+        raw_path, cache_dir, use_cache, refit_survival, survival_path
+    )[0]
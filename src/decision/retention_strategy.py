@@ -1,12 +1,20 @@
 import numpy as np
 import pandas as pd
 
+from src.categories import ACTION_SEGMENT_DTYPE
 from src.config import SAVE_RATE
 
-
 # --------------------------------------------------
 # Tier 2: Strategy-aware policy layer
 # --------------------------------------------------
+# Ranking weight per risk band for each business strategy.
+STRATEGY_WEIGHTS = {
+    "conservative": {"HIGH": 1.0, "MEDIUM": 0.25, "LOW": 0.05},
+    "balanced": {"HIGH": 1.0, "MEDIUM": 0.6, "LOW": 0.15},
+    "aggressive": {"HIGH": 1.0, "MEDIUM": 0.85, "LOW": 0.4},
+}
+
+
 def apply_decision_strategy(df, strategy: str):
     """
     Adjust retention priority based on business strategy.
@@ -14,31 +22,11 @@ def apply_decision_strategy(df, strategy: str):
     """
     df = df.copy()
     strategy = strategy.lower()
-
-    if strategy == "conservative":
-        df["strategy_weight"] = df["risk_band"].map({
-            "HIGH": 1.0,
-            "MEDIUM": 0.25,
-            "LOW": 0.05
-        })
-
-    elif strategy == "balanced":
-        df["strategy_weight"] = df["risk_band"].map({
-            "HIGH": 1.0,
-            "MEDIUM": 0.6,
-            "LOW": 0.15
-        })
-
-    elif strategy == "aggressive":
-        df["strategy_weight"] = df["risk_band"].map({
-            "HIGH": 1.0,
-            "MEDIUM": 0.85,
-            "LOW": 0.4
-        })
-
-    else:
+    if strategy not in STRATEGY_WEIGHTS:
         raise ValueError(f"Unknown strategy: {strategy}")
 
+    df["strategy_weight"] = df["risk_band"].map(STRATEGY_WEIGHTS[strategy]).astype(float)
+
     df["adjusted_priority"] = (
         df["retention_priority_score"] * df["strategy_weight"]
     )
@@ -129,9 +117,13 @@ def assign_action_segments(full_df, selected_df):
     df = full_df.copy()
     selected_ids = set(selected_df["customer_id"])
 
-    df["action_segment"] = np.where(
-        df["customer_id"].isin(selected_ids), "ACT",
-        np.where(df["net_retention_value"] > 0, "MONITOR", "IGNORE"),
+    # Codes into the shared ACT / MONITOR / IGNORE dictionary.
+    df["action_segment"] = pd.Categorical.from_codes(
+        np.where(
+            df["customer_id"].isin(selected_ids), 0,
+            np.where(df["net_retention_value"] > 0, 1, 2),
+        ),
+        dtype=ACTION_SEGMENT_DTYPE,
     )
     return df
 
@@ -0,0 +1,298 @@
+"""Discrete-time survival for integer tenure: a fast, individualized CLV backend.
+
+Telco tenure is whole months, so churn can be modelled directly as a monthly
+hazard: h_i(t) = sigmoid(alpha_t + x_i . beta), one intercept per month plus
+covariate effects — the logistic person-period model. S_i(t) is the running
+product of (1 - h_i(u)), and remaining life is the same restricted mean
+residual life the Cox and KM backends use.
+
+The person-period table (one row per customer per month at risk) is never
+built. Customers are collapsed into covariate patterns and the likelihood is
+accumulated month by month from at-risk / event counts per (pattern, month):
+patterns are ordered by their longest tenure, so the patterns at risk in
+month t are a prefix, and the at-risk counts are updated in place as the
+month loop walks down. Memory is O(patterns), not O(customer-months).
+
+Months in which nobody churned get hazard 0 (the maximum-likelihood value),
+exactly as the Kaplan-Meier curve stays flat there.
+
+Benchmark against Cox and KM:  python -m src.discrete_survival --rows 500000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.survival import (
+    _factorize_rows,
+    _newton_maximize,
+    covariate_layout,
+    covariate_patterns,
+    cox_design_matrix,
+    reference_sample,
+    residual_life_by_pattern,
+)
+
+
+class DiscreteConvergenceError(ValueError):
+    """The discrete-time hazard Newton-Raphson solver failed to converge."""
+
+
+def _pattern_counts(Z, durations, events):
+    """Unique patterns (ordered by longest tenure, descending) and the
+    customer / event counts of every (pattern, tenure) pair."""
+    pattern_id, n_patterns = _factorize_rows(list(Z.T))
+    longest = np.full(n_patterns, -1)
+    np.maximum.at(longest, pattern_id, durations)
+    order = np.argsort(-longest, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(n_patterns)
+    pattern_id = rank[pattern_id]
+
+    patterns = np.empty((n_patterns, Z.shape[1]))
+    patterns[pattern_id] = Z
+    span = int(durations.max()) + 1
+    codes, keys = pd.factorize(pattern_id * span + durations)
+    customers = np.bincount(codes)
+    churned = np.bincount(codes, weights=events)
+    return patterns, longest[order], keys // span, keys % span, customers, churned
+
+
+def _discrete_likelihood(patterns, longest, pair_pattern, pair_tenure,
+                         pair_customers, pair_churned, months, alpha, beta, penalty):
+    """Penalized log-likelihood, gradient and Hessian over (alpha, beta).
+
+    Walks months from the last down to 0, adding each tenure's customers to the
+    running at-risk counts; only event months carry a parameter. Per month the
+    work is over the at-risk prefix of patterns, and the beta-beta block is
+    assembled once from the per-pattern weight totals.
+    """
+    n_patterns, k = patterns.shape
+    eta = patterns @ beta
+    at_risk = np.zeros(n_patterns)
+    churned = np.zeros(n_patterns)
+    resid = np.zeros(n_patterns)
+    weight = np.zeros(n_patterns)
+    m = len(months)
+    grad = np.zeros(m + k)
+    hess = np.zeros((m + k, m + k))
+    loglik = 0.0
+
+    by_tenure = np.argsort(-pair_tenure, kind="stable")
+    last = int(longest.max())
+    # pairs with tenure t are by_tenure[bounds[t + 1]:bounds[t]]
+    bounds = np.searchsorted(-pair_tenure[by_tenure], -np.arange(last + 2), side="right")
+    slot = {int(t): j for j, t in enumerate(months)}
+    for t in range(last, -1, -1):
+        joining = by_tenure[bounds[t + 1]:bounds[t]]
+        at_risk[pair_pattern[joining]] += pair_customers[joining]
+        if t not in slot:
+            continue
+        j = slot[t]
+        a = int(np.searchsorted(-longest, -t, side="right"))  # patterns at risk
+        churned[:a] = 0.0
+        churned[pair_pattern[joining]] = pair_churned[joining]
+        z = alpha[j] + eta[:a]
+        p = 1.0 / (1.0 + np.exp(-z))
+        n, d = at_risk[:a], churned[:a]
+        r = d - n * p
+        w = n * p * (1.0 - p)
+        loglik += d @ z - n @ np.logaddexp(0.0, z)
+        resid[:a] += r
+        weight[:a] += w
+        grad[j] = r.sum()
+        hess[j, j] = -w.sum()
+        hess[j, m:] = hess[m:, j] = -(w @ patterns[:a])
+
+    grad[m:] = patterns.T @ resid - penalty * beta
+    hess[m:, m:] = -(patterns.T @ (weight[:, None] * patterns))
+    hess[m:, m:][np.diag_indices(k)] -= penalty
+    loglik -= 0.5 * penalty * beta @ beta
+    return loglik, grad, hess
+
+
+def discrete_hazard_fit(X, durations, events, penalizer=0.1, max_iter=50, tol=1e-9) -> dict:
+    """Logistic discrete-time hazard fit from aggregated (pattern, month) counts.
+
+    Covariates are standardized and the L2 penalty is n * penalizer / 2 * |b|^2
+    on the standardized coefficients (the Cox convention). Returns `alpha`
+    (logit baseline hazard per month 0..max tenure, -inf in months without
+    churn), `params` on the original scale and `norm_mean`.
+    """
+    X = np.asarray(X, dtype=float)
+    durations = np.asarray(durations).astype(np.int64)
+    events = np.asarray(events).astype(float)
+
+    norm_mean = X.mean(axis=0)
+    norm_std = X.std(axis=0, ddof=1)
+    norm_std[norm_std == 0] = 1.0
+    Z = (X - norm_mean) / norm_std
+    counts = _pattern_counts(Z, durations, events)
+
+    months = np.flatnonzero(np.bincount(durations, weights=events))
+    at_risk = np.cumsum(np.bincount(durations)[::-1])[::-1]
+    crude = np.bincount(durations, weights=events)[months] / at_risk[months]
+    theta = np.concatenate([np.log(crude / (1.0 - crude + 1e-12)), np.zeros(Z.shape[1])])
+    penalty = len(Z) * penalizer
+    m = len(months)
+
+    def evaluate(params):
+        return _discrete_likelihood(*counts, months, params[:m], params[m:], penalty)
+
+    theta, loglik = _newton_maximize(
+        evaluate, theta, max_iter, tol, DiscreteConvergenceError, "Discrete-time hazard fit"
+    )
+
+    alpha = np.full(int(durations.max()) + 1, -np.inf)
+    alpha[months] = theta[:m]
+    return {
+        "alpha": alpha,
+        "params": theta[m:] / norm_std,
+        "norm_mean": norm_mean,
+        "log_likelihood": float(loglik),
+    }
+
+
+def fit_discrete_artifact(
+    df, numeric_covariates, categorical_covariates,
+    duration_col, event_col, penalizer=0.1, reference_rows=5_000,
+) -> dict:
+    """Fit the discrete-time hazard model into a numpy-scorable artifact
+    (same layout and drift reference as `fit_cox_artifact`)."""
+    artifact = covariate_layout(df, numeric_covariates, categorical_covariates)
+    artifact.update({"penalizer": penalizer, "fitter": "discrete"})
+    fit = discrete_hazard_fit(
+        cox_design_matrix(df, artifact), df[duration_col].to_numpy(),
+        df[event_col].to_numpy(), penalizer,
+    )
+    artifact.update({
+        "alpha": fit["alpha"],
+        "params": fit["params"],
+        "norm_mean": fit["norm_mean"],
+        "reference": reference_sample(artifact, df, reference_rows),
+        "n_train": int(len(df)),
+    })
+    return artifact
+
+
+def score_discrete_artifact(
+    artifact, df, duration_col, forward_months, chunk_size=50_000, numeric_bins=None,
+) -> np.ndarray:
+    """Expected remaining months per customer from a discrete-time artifact.
+
+    One survival curve per covariate pattern, S(t) = prod (1 - h(u)); months
+    past the training range carry hazard 0, as the Cox baseline stays flat.
+    """
+    X = cox_design_matrix(df, artifact)
+    for col, width in (numeric_bins or {}).items():
+        j = artifact["numeric_covariates"].index(col)
+        X[:, j] = (np.floor(X[:, j] / width) + 0.5) * width
+    tenures = df[duration_col].to_numpy()
+    grid = int(tenures.max()) + int(forward_months) + 1
+    alpha = np.full(grid, -np.inf)
+    fitted = artifact["alpha"][:grid]
+    alpha[:len(fitted)] = fitted
+
+    patterns, pair_pattern, pair_tenure, inverse = covariate_patterns(X, tenures)
+    eta = (patterns - artifact["norm_mean"]) @ artifact["params"]
+
+    def survival_block(lo, hi):
+        hazard = 1.0 / (1.0 + np.exp(-(alpha[:, None] + eta[None, lo:hi])))
+        return np.cumprod(1.0 - hazard, axis=0)
+
+    remaining = residual_life_by_pattern(
+        survival_block, len(patterns), pair_pattern, pair_tenure, forward_months, chunk_size
+    )
+    return remaining[inverse]
+
+
+def discrete_expected_remaining(
+    df, numeric_covariates, categorical_covariates,
+    duration_col, event_col, forward_months, penalizer=0.1, chunk_size=50_000,
+) -> pd.Series:
+    """Expected remaining months per customer from a discrete-time hazard fit."""
+    artifact = fit_discrete_artifact(
+        df, numeric_covariates, categorical_covariates, duration_col, event_col, penalizer
+    )
+    remaining = score_discrete_artifact(artifact, df, duration_col, forward_months, chunk_size)
+    return pd.Series(remaining, index=df.index)
+
+
+def _benchmark(rows: int) -> pd.DataFrame:
+    """Runtime and accuracy of the KM, Cox and discrete-time CLV backends.
+
+    Runtime: fit + score on the Telco table resampled to `rows` customers.
+    Accuracy on a 70/30 Telco split: holdout concordance of each model's
+    restricted mean lifetime (from tenure 0) with the observed churn times,
+    and agreement of per-customer remaining life with the lifelines Cox fit.
+    """
+    import warnings
+
+    from lifelines.utils import concordance_index
+
+    from src.config import (
+        CLV_HORIZON_MONTHS,
+        COX_CATEGORICAL_COVARIATES,
+        COX_NUMERIC_COVARIATES,
+        RAW_DATA_PATH,
+    )
+    from src.ingest import load_clean_telco_data
+    from src.survival import cox_expected_remaining, expected_remaining_by_group
+
+    covariates = (COX_NUMERIC_COVARIATES, COX_CATEGORICAL_COVARIATES, "tenure", "churned")
+    backends = {
+        "km": lambda df: expected_remaining_by_group(
+            df, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS
+        ),
+        "cox (lifelines)": lambda df: cox_expected_remaining(
+            df, *covariates, CLV_HORIZON_MONTHS
+        ),
+        "cox (native)": lambda df: cox_expected_remaining(
+            df, *covariates, CLV_HORIZON_MONTHS, fitter="native"
+        ),
+        "discrete": lambda df: discrete_expected_remaining(
+            df, *covariates, CLV_HORIZON_MONTHS
+        ),
+    }
+
+    telco = load_clean_telco_data(RAW_DATA_PATH)
+    train = telco.sample(frac=0.7, random_state=0)
+    test = telco.drop(train.index)
+    big = telco.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+
+    results, reference = [], None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, backend in backends.items():
+            t0 = time.perf_counter()
+            backend(big)
+            seconds = time.perf_counter() - t0
+
+            # Holdout: test customers are appended censored at tenure 0, where
+            # nobody churns, so they never enter an event-time risk set; each
+            # backend then scores their lifetime from the start.
+            pooled = pd.concat([train, test.assign(tenure=0, churned=0)])
+            lifetime = backend(pooled).loc[test.index]
+            c_index = concordance_index(test["tenure"], lifetime, test["churned"])
+
+            remaining = backend(telco)
+            if name == "cox (lifelines)":
+                reference = remaining
+            results.append({
+                "method": name, "rows": rows, "fit_score_s": round(seconds, 3),
+                "holdout_c_index": round(c_index, 4), "remaining": remaining,
+            })
+    for row in results:
+        remaining = row.pop("remaining")
+        row["corr_vs_cox"] = round(float(remaining.corr(reference)), 4)
+        row["mae_vs_cox_months"] = round(float((remaining - reference).abs().mean()), 3)
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CLV survival backends.")
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+    print(_benchmark(args.rows).to_string(index=False))
@@ -5,61 +5,273 @@ plan, MRR, CLV, retention_cost. Assumptions are documented in
 docs/economic_assumptions.md.
 """
 
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
 from src.config import (
     CLV_HORIZON_MONTHS,
     CLV_METHOD,
     COX_CATEGORICAL_COVARIATES,
+    COX_CHUNK_SIZE,
+    COX_NUMERIC_BINS,
     COX_NUMERIC_COVARIATES,
     DISCOUNT_RATE,
     OFFER_MONTHS,
     OUTREACH_COST,
+    SURVIVAL_MODEL_PATH,
+)
+from src.discrete_survival import (
+    DiscreteConvergenceError,
+    fit_discrete_artifact,
+    score_discrete_artifact,
+)
+from src.logging_config import get_logger
+from src.survival import (
+    CoxConvergenceError,
+    expected_remaining_by_group,
+    fit_cox_artifact,
+    kaplan_meier_by_group,
+    load_cox_artifact,
+    save_cox_artifact,
+    score_cox_artifact,
 )
-from src.survival import cox_expected_remaining, expected_remaining_by_group
 
-# Cox needs a reasonable sample to fit; below this we use Kaplan-Meier.
+log = get_logger("economics")
+
+# Cox needs a reasonable sample to fit; below this we use Kaplan-Meier. Drift
+# statistics on fewer rows are noise, so smaller batches reuse the saved fit.
 _MIN_COX_ROWS = 200
 
+# CLV_METHOD values backed by a per-customer survival model, and its fitter.
+_SURVIVAL_FITTERS = {"cox": "lifelines", "cox_native": "native", "discrete": "discrete"}
+
+
+def _fit_artifact(df: pd.DataFrame) -> dict:
+    args = (df, COX_NUMERIC_COVARIATES, COX_CATEGORICAL_COVARIATES, "tenure", "churned")
+    fitter = _SURVIVAL_FITTERS[CLV_METHOD]
+    if fitter == "discrete":
+        return fit_discrete_artifact(*args)
+    return fit_cox_artifact(*args, fitter=fitter)
+
+
+def _score_artifact(artifact: dict, df: pd.DataFrame) -> pd.Series:
+    score = score_discrete_artifact if artifact["fitter"] == "discrete" else score_cox_artifact
+    return pd.Series(score(
+        artifact, df, "tenure", CLV_HORIZON_MONTHS,
+        chunk_size=COX_CHUNK_SIZE, numeric_bins=COX_NUMERIC_BINS,
+    ), index=df.index)
+
+
+def _artifact_is_current(artifact: dict) -> bool:
+    return (
+        artifact.get("fitter") == _SURVIVAL_FITTERS[CLV_METHOD]
+        and artifact.get("numeric_covariates") == list(COX_NUMERIC_COVARIATES)
+        and artifact.get("categorical_covariates") == list(COX_CATEGORICAL_COVARIATES)
+    )
+
+
+def _has_drifted(artifact: dict, df: pd.DataFrame) -> bool:
+    from src.monitoring import drift_report
+
+    report = drift_report(
+        artifact["reference"], df, COX_NUMERIC_COVARIATES, COX_CATEGORICAL_COVARIATES
+    )
+    drifted = report.loc[report["drift"], "feature"].tolist()
+    if drifted:
+        log.info("Survival covariates drifted (%s); refitting", ", ".join(drifted))
+    return bool(drifted)
+
+
+def load_or_fit_survival_artifact(
+    df: pd.DataFrame, path: Path = SURVIVAL_MODEL_PATH, refit: bool = False
+) -> dict | None:
+    """The persisted survival artifact, refitted on `df` only when necessary.
+
+    Refits when asked to, when no artifact exists, when the configured
+    covariates changed, or when `df` has drifted from the artifact's training
+    sample; otherwise the saved fit is reused. Batches below _MIN_COX_ROWS are
+    too small to test for drift (or to refit on) and reuse a current artifact
+    as-is. Returns None when CLV_METHOD is not model-based or the model cannot
+    be fitted (callers fall back to KM).
+    """
+    from lifelines.exceptions import ConvergenceError
+
+    if CLV_METHOD not in _SURVIVAL_FITTERS:
+        return None
+    path = Path(path)
+    if not refit and path.exists():
+        artifact = load_cox_artifact(path)
+        if _artifact_is_current(artifact) and (
+            len(df) < _MIN_COX_ROWS or not _has_drifted(artifact, df)
+        ):
+            return artifact
+    if len(df) < _MIN_COX_ROWS:
+        return None
+    try:
+        artifact = _fit_artifact(df)
+    except (
+        CoxConvergenceError, DiscreteConvergenceError, ConvergenceError,
+        np.linalg.LinAlgError,
+    ) as exc:
+        log.warning("Survival model fit failed (%s); falling back to Kaplan-Meier", exc)
+        return None
+    save_cox_artifact(artifact, path)
+    log.info("Survival artifact fitted on %d customers -> %s", len(df), path)
+    return artifact
+
+
+class SurvivalResults:
+    """One run's survival estimates, shared by economics and diagnostics.
+
+    Holds the per-customer model remaining life (Cox or discrete-time; None
+    when the model was unavailable), the per-contract KM remaining life with
+    its curves, and fit metadata. CLV reads `remaining`; the pipeline's
+    model-vs-KM comparison reads both columns — neither refits anything.
+    """
+
+    def __init__(self, km_remaining, km_curves, model_remaining=None, meta=None):
+        self.km_remaining = km_remaining
+        self.km_curves = km_curves
+        self.model_remaining = model_remaining
+        self.meta = dict(meta or {})
+
+    @property
+    def method(self) -> str:
+        """The survival method CLV actually used: CLV_METHOD, or "km"."""
+        return "km" if self.model_remaining is None else self.meta["method"]
+
+    @property
+    def remaining(self) -> pd.Series:
+        """Expected remaining months per customer, as used for CLV."""
+        return self.km_remaining if self.model_remaining is None else self.model_remaining
+
+    def to_frame(self) -> pd.DataFrame:
+        """Per-customer columns, with curves and metadata in `attrs`."""
+        model = (
+            np.full(len(self.km_remaining), np.nan) if self.model_remaining is None
+            else self.model_remaining.to_numpy()
+        )
+        frame = pd.DataFrame({
+            "remaining_months": self.remaining.to_numpy(),
+            "model_remaining_months": model,
+            "km_remaining_months": self.km_remaining.to_numpy(),
+        })
+        frame.attrs = {
+            **self.meta,
+            "km_curves": {
+                str(label): [times.tolist(), survival.tolist()]
+                for label, (times, survival) in self.km_curves.items()
+            },
+        }
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, index=None) -> "SurvivalResults":
+        """Rebuild results saved with `to_frame` (e.g. from the customer cache)."""
+        index = frame.index if index is None else index
+        meta = dict(frame.attrs)
+        curves = {
+            label: (np.asarray(times, dtype=float), np.asarray(survival, dtype=float))
+            for label, (times, survival) in meta.pop("km_curves", {}).items()
+        }
+        model = frame["model_remaining_months"]
+        return cls(
+            pd.Series(frame["km_remaining_months"].to_numpy(), index=index),
+            curves,
+            None if model.isna().all() else pd.Series(model.to_numpy(), index=index),
+            meta,
+        )
+
 
-def expected_remaining_months(df: pd.DataFrame) -> pd.Series:
-    """Per-customer expected remaining lifetime, via Cox or KM.
+def survival_results(
+    df: pd.DataFrame, survival_artifact: dict | None = None
+) -> SurvivalResults:
+    """Fit / score every survival estimate a run needs, exactly once.
 
-    Cox (per-customer, uses all covariates) is preferred; falls back to the
-    per-contract Kaplan-Meier estimator if Cox is unavailable, the sample is
-    too small, or the fit misbehaves.
+    The per-customer models (Cox, or the discrete-time monthly hazard) use all
+    covariates and drive CLV; they are dropped in favour of the per-contract
+    Kaplan-Meier estimator if unavailable, the sample is too small, or the fit
+    misbehaves. KM is always computed (one batched pass) for the comparison.
+    With a fitted `survival_artifact` the model is only scored, not refitted.
     """
-    if CLV_METHOD == "cox" and len(df) >= _MIN_COX_ROWS:
+    curves = kaplan_meier_by_group(df["Contract"], df["tenure"], df["churned"])
+    km_rem = expected_remaining_by_group(
+        df, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS, curves=curves
+    )
+    if CLV_METHOD in _SURVIVAL_FITTERS and (
+        survival_artifact is not None or len(df) >= _MIN_COX_ROWS
+    ):
         try:
-            rem = cox_expected_remaining(
-                df, COX_NUMERIC_COVARIATES, COX_CATEGORICAL_COVARIATES,
-                "tenure", "churned", CLV_HORIZON_MONTHS,
-            )
+            artifact = survival_artifact or _fit_artifact(df)
+            rem = _score_artifact(artifact, df)
             if rem.notna().all() and (rem > 0).all():
-                return rem
+                meta = {
+                    "method": CLV_METHOD,
+                    "fitter": artifact["fitter"],
+                    "n_train": artifact["n_train"],
+                }
+                return SurvivalResults(km_rem, curves, rem, meta)
         except Exception:
             pass  # fall through to KM
-    return expected_remaining_by_group(
-        df, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS
+    return SurvivalResults(km_rem, curves)
+
+
+def expected_remaining_months(
+    df: pd.DataFrame, survival_artifact: dict | None = None
+) -> pd.Series:
+    """Per-customer expected remaining lifetime, via Cox, discrete-time or KM.
+
+    See `survival_results`; this is its CLV column.
+    """
+    return survival_results(df, survival_artifact).remaining
+
+
+def offer_cost(
+    df: pd.DataFrame,
+    outreach_cost: dict = OUTREACH_COST,
+    discount_rate: float = DISCOUNT_RATE,
+    offer_months: int = OFFER_MONTHS,
+) -> pd.Series:
+    """Retention cost: contract-dependent outreach cost plus a win-back
+    discount that scales with MRR — so cost varies per customer.
+
+    The only economic field the offer parameters touch, and a single
+    vectorized expression: changing an offer never needs the survival model.
+    """
+    return (
+        df["Contract"].map(outreach_cost).astype(float)
+        + discount_rate * df["MonthlyCharges"] * offer_months
     )
 
 
-def add_economic_fields(df: pd.DataFrame) -> pd.DataFrame:
-    """Add plan, MRR, CLV and retention_cost columns (pure function)."""
+def attach_economic_fields(
+    df: pd.DataFrame, clv: pd.Series, retention_cost: pd.Series
+) -> pd.DataFrame:
+    """Add plan, MRR, CLV and retention_cost from precomputed layers."""
     df = df.copy()
-
     df["plan"] = df["Contract"]
     df["MRR"] = df["MonthlyCharges"]
+    df["CLV"] = np.asarray(clv, dtype=float)
+    df["retention_cost"] = np.asarray(retention_cost, dtype=float)
+    return df
 
-    # CLV: expected remaining revenue = MRR x expected remaining lifetime,
-    # estimated from a survival model (Cox per-customer, or KM per-contract).
-    df["CLV"] = df["MRR"] * expected_remaining_months(df)
 
-    # Retention cost: contract-dependent outreach cost plus a win-back
-    # discount that scales with MRR — so cost varies per customer.
-    df["retention_cost"] = (
-        df["Contract"].map(OUTREACH_COST)
-        + DISCOUNT_RATE * df["MRR"] * OFFER_MONTHS
-    )
+def add_economic_fields(
+    df: pd.DataFrame,
+    survival_artifact: dict | None = None,
+    survival: SurvivalResults | None = None,
+) -> pd.DataFrame:
+    """Add plan, MRR, CLV and retention_cost columns (pure function).
 
-    return df
+    Pass a fitted `survival_artifact` to score CLV for new or changed
+    customers without refitting the survival model, or this run's
+    `survival` results to reuse them outright.
+    """
+    # CLV: expected remaining revenue = MRR x expected remaining lifetime,
+    # estimated from a survival model (Cox per-customer, or KM per-contract).
+    if survival is None:
+        survival = survival_results(df, survival_artifact)
+    clv = df["MonthlyCharges"] * survival.remaining
+    return attach_economic_fields(df, clv, offer_cost(df))
@@ -7,8 +7,10 @@ drive the decision layer, not the churn signal.
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from src.categories import compact_categoricals
 from src.config import DB_PATH
 from src.sql_feature_queries import load_customers_from_sql
 
@@ -26,8 +28,47 @@ FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
 
 CONTRACT_COLUMNS = ["customer_id", "plan", "MRR", "CLV", "retention_cost", "churned"]
 
+# Declared once: the dtypes every feature-table read is materialized with, so
+# scoring never pays for pandas' object-dtype inference on string columns.
+# Categories are then recoded to the shared dictionaries in src/categories.py.
+FEATURE_DTYPES = {
+    "customer_id": "object",
+    "plan": "category",
+    "MRR": "float64",
+    "CLV": "float64",
+    "retention_cost": "float64",
+    "churned": "int8",
+    **{c: "float64" for c in NUMERIC_FEATURES},
+    **{c: "category" for c in CATEGORICAL_FEATURES},
+    "SeniorCitizen": "int8",
+}
 
-def build_feature_table(db_path: Path = DB_PATH) -> pd.DataFrame:
-    """One row per customer: model features + decision-contract columns."""
-    df = load_customers_from_sql(db_path)
-    return df[CONTRACT_COLUMNS + FEATURES]
+
+def feature_arrays(df: pd.DataFrame) -> dict:
+    """Pre-built numpy arrays for a feature table.
+
+    `numeric` is an (n, len(NUMERIC_FEATURES)) float64 matrix, `codes` an
+    (n, len(CATEGORICAL_FEATURES)) matrix of category codes (-1 = missing) with
+    the per-column category labels in `categories`; decision-contract columns
+    are passed through as 1-D arrays under their own names.
+    """
+    cats = {c: df[c].astype("category") for c in CATEGORICAL_FEATURES}
+    out = {c: df[c].to_numpy() for c in CONTRACT_COLUMNS}
+    out["numeric"] = df[NUMERIC_FEATURES].to_numpy(dtype=np.float64)
+    out["codes"] = np.column_stack(
+        [cats[c].cat.codes.to_numpy() for c in CATEGORICAL_FEATURES]
+    )
+    out["categories"] = {c: cats[c].cat.categories.tolist() for c in CATEGORICAL_FEATURES}
+    return out
+
+
+def build_feature_table(db_path: Path = DB_PATH, as_arrays: bool = False):
+    """One row per customer: model features + decision-contract columns.
+
+    Only these columns are read from SQLite, typed per FEATURE_DTYPES. With
+    `as_arrays=True`, returns `feature_arrays(...)` instead of the frame.
+    """
+    df = compact_categoricals(load_customers_from_sql(
+        db_path, columns=CONTRACT_COLUMNS + FEATURES, dtypes=FEATURE_DTYPES
+    ))
+    return feature_arrays(df) if as_arrays else df
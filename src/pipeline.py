@@ -2,44 +2,75 @@
 
 Usage:
     python -m src.pipeline [--force-download]
+    python -m src.pipeline --reprice    # offer parameters changed: cost only
 """
 
 import argparse
 import json
+import time
 
-import pandas as pd
-
+from src.batch_scoring import score_to_sqlite
 from src.config import (
-    CLV_HORIZON_MONTHS,
-    CLV_METHOD,
+    COMPILED_MODEL_PATH,
     DB_PATH,
     METRICS_PATH,
     MODEL_PATH,
     RAW_DATA_PATH,
+    SQLITE_LOAD_MODE,
 )
-from src.economics import add_economic_fields
+from src.customer_cache import load_customers, load_customers_and_survival
 from src.features.feature_builder import build_feature_table
-from src.ingest import clean_telco_data, download_telco_data
-from src.load_to_sqlite import load_to_sqlite
+from src.ingest import download_telco_data
+from src.load_to_sqlite import load_to_sqlite, update_columns
 from src.logging_config import get_logger
 from src.models.train_logistic import (
     compare_models,
+    compile_model,
     feature_importances,
+    save_compiled_model,
     save_model,
     train_and_evaluate,
 )
 from src.models.tuning import compare_calibration, tune_gbm
 from src.sql_feature_queries import churn_summary_by_segment
-from src.survival import expected_remaining_by_group
 
 log = get_logger("pipeline")
 
 
-def run_pipeline(force_download: bool = False, tune: bool = False) -> dict:
+def reprice_offers(use_cache: bool = True) -> dict:
+    """Propagate changed offer parameters without refitting or retraining.
+
+    DISCOUNT_RATE / OFFER_MONTHS / OUTREACH_COST feed only retention_cost, so
+    only the cost layer of the customer cache is recomputed and only that
+    column is rewritten in SQLite; survival, CLV and the churn model are
+    untouched. Scored tables pick it up via `app.core.reprice_scored`.
+    """
+    t0 = time.perf_counter()
+    customers = load_customers(RAW_DATA_PATH, use_cache=use_cache)
+    if DB_PATH.exists():
+        updated = update_columns(customers, ["retention_cost"], DB_PATH)
+    else:
+        updated = load_to_sqlite(customers, DB_PATH, mode=SQLITE_LOAD_MODE)["inserted"]
+    seconds = time.perf_counter() - t0
+    log.info("Re-priced %d customers in %.0f ms", updated, 1000 * seconds)
+    return {"customers": updated, "seconds": seconds}
+
+
+def run_pipeline(
+    force_download: bool = False,
+    tune: bool = False,
+    use_cache: bool = True,
+    refit_survival: bool = False,
+) -> dict:
     csv_path = download_telco_data(RAW_DATA_PATH, force=force_download)
 
-    raw = pd.read_csv(csv_path)
-    customers = add_economic_fields(clean_telco_data(raw))
+    # Clean + economics, served from the columnar cache when neither the raw
+    # file nor the economic config changed (no parsing, no survival refit).
+    # On a miss the persisted survival artifact is reused unless it drifted.
+    # The survival estimates come back with it, so nothing is refitted below.
+    customers, survival = load_customers_and_survival(
+        csv_path, use_cache=use_cache, refit_survival=refit_survival
+    )
     log.info(
         "Cleaned %d customers (churn rate %.1f%%)",
         len(customers), 100 * customers["churned"].mean(),
@@ -47,23 +78,27 @@ def run_pipeline(force_download: bool = False, tune: bool = False) -> dict:
 
     # CLV survival-method comparison: KM gives one lifetime per contract; Cox
     # individualizes it per customer using all covariates.
-    cox_rem = customers["CLV"] / customers["MRR"]
-    km_rem = expected_remaining_by_group(
-        customers, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS
-    )
-    within = cox_rem.groupby(customers["Contract"]).std().mean()
-    log.info(
-        "CLV lifetime via '%s' (corr with KM %.2f; Cox adds %.1f-month "
-        "within-contract spread that KM cannot)",
-        CLV_METHOD, cox_rem.corr(km_rem), within,
-    )
+    if survival.model_remaining is None:
+        log.info("CLV lifetime via per-contract KM (no survival model available)")
+    else:
+        model_rem = survival.model_remaining
+        within = model_rem.groupby(customers["Contract"], observed=True).std().mean()
+        log.info(
+            "CLV lifetime via '%s' (%s fit on %d customers; corr with KM %.2f; "
+            "adds %.1f-month within-contract spread that KM cannot)",
+            survival.method, survival.meta["fitter"], survival.meta["n_train"],
+            model_rem.corr(survival.km_remaining), within,
+        )
 
-    load_to_sqlite(customers, DB_PATH)
+    load_to_sqlite(customers, DB_PATH, mode=SQLITE_LOAD_MODE)
 
     features = build_feature_table(DB_PATH)
     pipeline, metrics = train_and_evaluate(features)
     artifact = save_model(pipeline, MODEL_PATH)
-    log.info("Model saved to %s", artifact)
+    compiled = compile_model(pipeline)
+    compiled_path = save_compiled_model(compiled, COMPILED_MODEL_PATH)
+    log.info("Model saved to %s (compiled for numpy scoring: %s)", artifact, compiled_path)
+    score_to_sqlite(DB_PATH, compiled=compiled)
 
     calibration = metrics.pop("calibration_table")
     profit_thr = metrics.pop("profit_threshold")
@@ -149,8 +184,31 @@ def main() -> None:
         action="store_true",
         help="Run Optuna gradient-boosting tuning (~30s extra).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild the cleaned customer table instead of reading the cache.",
+    )
+    parser.add_argument(
+        "--reprice",
+        action="store_true",
+        help="Only recompute retention_cost after an offer-parameter change.",
+    )
+    parser.add_argument(
+        "--refit-survival",
+        action="store_true",
+        help="Refit the Cox survival artifact even if the saved one is current.",
+    )
     args = parser.parse_args()
-    run_pipeline(force_download=args.force_download, tune=args.tune)
+    if args.reprice:
+        reprice_offers(use_cache=not args.no_cache)
+        return
+    run_pipeline(
+        force_download=args.force_download,
+        tune=args.tune,
+        use_cache=not args.no_cache,
+        refit_survival=args.refit_survival,
+    )
 
 
 if __name__ == "__main__":
@@ -8,18 +8,44 @@ import pandas as pd
 from src.config import DB_PATH
 
 
-def load_customers_from_sql(db_path: Path = DB_PATH) -> pd.DataFrame:
+def load_customers_from_sql(
+    db_path: Path = DB_PATH,
+    columns: list[str] | None = None,
+    dtypes: dict | None = None,
+) -> pd.DataFrame:
+    """Read the customers table, optionally projected to `columns`.
+
+    Projection happens in SQL, so unselected columns are never moved; `dtypes`
+    materializes the result with declared types instead of inferred objects.
+    """
     db_path = Path(db_path)
     if not db_path.exists():
         raise FileNotFoundError(
             f"Database not found at {db_path} — run `python -m src.pipeline` first."
         )
+    select = ", ".join(f'"{c}"' for c in columns) if columns else "*"
     with sqlite3.connect(db_path) as conn:
-        return pd.read_sql("SELECT * FROM customers", conn)
+        return pd.read_sql_query(f"SELECT {select} FROM customers", conn, dtype=dtypes)
 
 
 def churn_summary_by_segment(db_path: Path = DB_PATH) -> pd.DataFrame:
-    """In-database churn summary by contract and internet service."""
+    """In-database churn summary by contract and internet service.
+
+    Read from the `segment_stats` running sums the loader maintains — O(segments)
+    — falling back to a full GROUP BY over customers for older databases.
+    """
+    materialized = """
+        SELECT
+            Contract,
+            InternetService,
+            customers,
+            ROUND(1.0 * churned_sum / customers, 3) AS churn_rate,
+            ROUND(mrr_sum / customers, 2)           AS avg_mrr,
+            ROUND(clv_sum / customers, 2)           AS avg_clv
+        FROM segment_stats
+        WHERE customers > 0
+        ORDER BY churn_rate DESC
+    """
     query = """
         SELECT
             Contract,
@@ -33,4 +59,7 @@ def churn_summary_by_segment(db_path: Path = DB_PATH) -> pd.DataFrame:
         ORDER BY churn_rate DESC
     """
     with sqlite3.connect(Path(db_path)) as conn:
-        return pd.read_sql(query, conn)
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segment_stats'"
+        ).fetchone()
+        return pd.read_sql(materialized if has_stats else query, conn)
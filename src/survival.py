@@ -7,8 +7,14 @@ type, from which we derive an *empirical* expected remaining lifetime — used
 by the CLV model instead of a hand-tuned formula.
 
 Implemented from scratch (no lifelines dependency) to keep the method explicit.
+The Cox model can be fitted either by lifelines or by the native numpy
+`cox_ph_fit`, which matches lifelines' coefficients and scales to millions of
+rows without importing it.
 """
 
+from pathlib import Path
+
+import joblib
 import numpy as np
 import pandas as pd
 
@@ -24,20 +30,73 @@ def kaplan_meier(durations, events):
     Returns
     -------
     (times, survival) : sorted unique event/censor times and S(t) at each.
+
+    One sort plus cumulative counts, O(n log n): the number at risk at time t
+    is n minus everyone whose duration ended before t.
     """
     durations = np.asarray(durations, dtype=float)
     events = np.asarray(events, dtype=int)
 
-    times = np.unique(durations)
-    survival = np.empty(len(times))
-    s = 1.0
-    for i, t in enumerate(times):
-        at_risk = np.count_nonzero(durations >= t)
-        deaths = np.count_nonzero((durations == t) & (events == 1))
-        if at_risk > 0:
-            s *= 1.0 - deaths / at_risk
-        survival[i] = s
-    return times, survival
+    times, inverse = np.unique(durations, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(times))
+    deaths = np.bincount(inverse, weights=events == 1, minlength=len(times))
+    at_risk = len(durations) - np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return times, np.cumprod(1.0 - deaths / at_risk)
+
+
+def kaplan_meier_from_counts(events, censored):
+    """Kaplan-Meier curve from event / censored counts per integer tenure.
+
+    `events[t]` and `censored[t]` count observations ending at tenure t; the
+    at-risk set is a reverse cumulative sum. Identical to `kaplan_meier` on
+    the underlying durations, at the cost of the tenure range only.
+    """
+    events = np.asarray(events)
+    observed = events + np.asarray(censored)
+    times = np.flatnonzero(observed)
+    at_risk = np.cumsum(observed[::-1])[::-1][times]
+    return times.astype(float), np.cumprod(1.0 - events[times] / at_risk)
+
+
+def kaplan_meier_by_group(groups, durations, events) -> dict:
+    """Kaplan-Meier curves for every group at once, from one sorted pass.
+
+    Rows are sorted once by (group, time); per-(group, time) counts come from a
+    single bincount, and each group's at-risk set is its total minus the
+    cumulative count of earlier times within the group. Returns
+    {group: (times, survival)}, each identical to `kaplan_meier` on that group.
+    """
+    group_codes, group_labels = pd.factorize(pd.Series(groups), sort=True)
+    keep = group_codes >= 0  # rows with a missing group belong to no curve
+    group_codes = group_codes[keep]
+    durations = np.asarray(durations, dtype=float)[keep]
+    events = np.asarray(events, dtype=int)[keep]
+
+    time_values, time_codes = np.unique(durations, return_inverse=True)
+    keys, inverse = np.unique(
+        group_codes.astype(np.int64) * len(time_values) + time_codes,
+        return_inverse=True,
+    )
+    counts = np.bincount(inverse)
+    deaths = np.bincount(inverse, weights=events == 1)
+    key_group = keys // len(time_values)
+
+    # Start offset of each group in the (group, time)-sorted key array.
+    starts = np.searchsorted(key_group, np.arange(len(group_labels)))
+    ends = np.append(starts[1:], len(keys))
+    cum = np.concatenate(([0], np.cumsum(counts)))
+    group_sizes = cum[ends] - cum[starts]
+    before = cum[:-1] - cum[starts][key_group]  # earlier times within the group
+    hazard = deaths / (group_sizes[key_group] - before)
+
+    curves = {}
+    for g, label in enumerate(group_labels):
+        lo, hi = starts[g], ends[g]
+        curves[label] = (
+            time_values[keys[lo:hi] % len(time_values)],
+            np.cumprod(1.0 - hazard[lo:hi]),
+        )
+    return curves
 
 
 def _survival_at(times, survival, query_months):
@@ -67,27 +126,561 @@ def expected_remaining_life(times, survival, at_tenure, forward_months):
     return float(conditional.sum())
 
 
+def residual_life_table(times, survival, max_tenure, forward_months) -> np.ndarray:
+    """Restricted mean residual life for every integer tenure 0..max_tenure.
+
+    Same quantity as `expected_remaining_life`, for all tenures at once: with
+    S evaluated on the integer grid and C its running sum,
+    sum over u in 1..F of S(a+u) / S(a) = (C[a+F] - C[a]) / S(a).
+    """
+    forward_months = int(forward_months)
+    grid = np.arange(int(max_tenure) + forward_months + 1)
+    idx = np.searchsorted(times, grid, side="right") - 1
+    s_grid = np.where(idx >= 0, survival[np.maximum(idx, 0)], 1.0)
+    cum = np.cumsum(s_grid)
+
+    a = np.arange(int(max_tenure) + 1)
+    s_a = s_grid[a]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = (cum[a + forward_months] - cum[a]) / s_a
+    return np.where(s_a <= 1e-9, 0.0, table)
+
+
 def expected_remaining_by_group(
-    df, group_col, duration_col, event_col, forward_months
+    df, group_col, duration_col, event_col, forward_months, curves=None
 ) -> pd.Series:
     """Expected remaining months for every row, from a per-group KM curve.
 
-    Fits one survival curve per `group_col` value and evaluates each customer's
-    conditional expected remaining life at their own tenure.
+    Fits one survival curve per `group_col` value (a single batched pass), turns
+    each into a residual-life table over integer tenures, and maps customers
+    through it with one vectorized (group, tenure) gather — O(n) overall.
+    Non-integer tenures fall back to evaluating each row directly. Pass
+    `curves` (from `kaplan_meier_by_group` on the same frame) to reuse a fit.
+    """
+    if curves is None:
+        curves = kaplan_meier_by_group(df[group_col], df[duration_col], df[event_col])
+    codes, labels = pd.factorize(df[group_col], sort=True)
+    tenure = df[duration_col].to_numpy(dtype=float)
+    remaining = np.full(len(df), np.nan)
+    known = codes >= 0
+    if not known.any():
+        return pd.Series(remaining, index=df.index)
+
+    if np.array_equal(tenure[known], np.floor(tenure[known])):
+        max_tenure = int(tenure[known].max())
+        tables = np.vstack([
+            residual_life_table(*curves[label], max_tenure, forward_months)
+            for label in labels
+        ])
+        remaining[known] = tables[codes[known], tenure[known].astype(int)]
+    else:
+        for i in np.flatnonzero(known):
+            times, survival = curves[labels[codes[i]]]
+            remaining[i] = expected_remaining_life(
+                times, survival, tenure[i], forward_months
+            )
+    return pd.Series(remaining, index=df.index)
+
+
+class OnlineKaplanMeier:
+    """Incremental per-group Kaplan-Meier state for integer tenures.
+
+    Holds, per group, the number of churn events and of censored observations
+    at every integer tenure — the sufficient statistics of the KM estimator.
+    A daily churn stream updates them in O(1) per event; curves and
+    residual-life tables are derived on demand, identical to `kaplan_meier` /
+    `residual_life_table` over the full history. A negative `count` retracts
+    earlier observations: when a censored customer churns or ages a month,
+    retract their old censored record and add the new one.
+
+    Persisted with `save` / `load` so the state survives restarts.
+    """
+
+    def __init__(self):
+        self._counts = {}  # group -> int64 array (2, capacity): events, censored
+
+    @classmethod
+    def from_frame(cls, df, group_col, duration_col, event_col) -> "OnlineKaplanMeier":
+        """Seed the state from a full history table."""
+        km = cls()
+        events = df[event_col].to_numpy() == 1
+        durations = df[duration_col].to_numpy()
+        for group, rows in df.groupby(group_col, observed=True).indices.items():
+            tenures = durations[rows]
+            km.add_events(group, tenures[events[rows]])
+            km.add_censored(group, tenures[~events[rows]])
+        return km
+
+    @property
+    def groups(self) -> list:
+        return sorted(self._counts)
+
+    def _add(self, kind, group, tenure, count):
+        tenure = np.atleast_1d(np.asarray(tenure))
+        if len(tenure) == 0:
+            return
+        if not np.array_equal(tenure, np.floor(tenure)) or tenure.min() < 0:
+            raise ValueError("OnlineKaplanMeier needs non-negative integer tenures")
+        tenure = tenure.astype(np.int64)
+        counts = self._counts.get(group)
+        needed = int(tenure.max()) + 1
+        if counts is None or counts.shape[1] < needed:
+            grown = np.zeros((2, max(needed, 2 * (0 if counts is None else counts.shape[1]))),
+                             dtype=np.int64)
+            if counts is not None:
+                grown[:, :counts.shape[1]] = counts
+            self._counts[group] = counts = grown
+        np.add.at(counts[kind], tenure, count)
+        if counts[kind][tenure].min() < 0:
+            np.add.at(counts[kind], tenure, -count)
+            raise ValueError(f"Retracting more observations than recorded for {group!r}")
+
+    def add_events(self, group, tenure, count=1) -> None:
+        """Record churn at `tenure` (a scalar or an array of tenures)."""
+        self._add(0, group, tenure, count)
+
+    def add_censored(self, group, tenure, count=1) -> None:
+        """Record still-active customers observed up to `tenure`."""
+        self._add(1, group, tenure, count)
+
+    def curve(self, group):
+        """(times, survival) for `group`, as `kaplan_meier` would return."""
+        return kaplan_meier_from_counts(*self._counts[group])
+
+    def residual_life_table(self, group, max_tenure, forward_months) -> np.ndarray:
+        return residual_life_table(*self.curve(group), max_tenure, forward_months)
+
+    def expected_remaining(self, groups, tenures, forward_months) -> np.ndarray:
+        """Remaining months for each (group, integer tenure); NaN for unknown groups."""
+        codes, labels = pd.factorize(pd.Series(groups))
+        tenures = np.asarray(tenures).astype(int)
+        remaining = np.full(len(tenures), np.nan)
+        if len(tenures) == 0:
+            return remaining
+        max_tenure = int(tenures.max())
+        for g, label in enumerate(labels):
+            if label in self._counts:
+                rows = codes == g
+                table = self.residual_life_table(label, max_tenure, forward_months)
+                remaining[rows] = table[tenures[rows]]
+        return remaining
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        joblib.dump({"counts": self._counts}, tmp)
+        tmp.replace(path)  # atomic: a crash never leaves a half-written state
+        return path
+
+    @classmethod
+    def load(cls, path) -> "OnlineKaplanMeier":
+        km = cls()
+        km._counts = joblib.load(Path(path))["counts"]
+        return km
+
+
+def ph_residual_life(
+    baseline_cumhaz, partial_hazard, tenures, forward_months, chunk_size=50_000,
+) -> np.ndarray:
+    """Restricted mean residual life per customer under proportional hazards.
+
+    `baseline_cumhaz` is H0 on the integer grid 0..max_tenure+forward, and
+    S_i(t) = exp(-H0(t) * v_i) for partial hazard v_i. Customers are processed
+    in chunks of `chunk_size`: each chunk builds its (grid x chunk) survival
+    block, takes a cumulative sum down the time axis and gathers
+    (C[t0+F] - C[t0]) / S(t0) per column — so peak memory is bounded by the
+    chunk, not the population, and there is no per-customer Python loop.
+    """
+    baseline_cumhaz = np.asarray(baseline_cumhaz, dtype=float)
+    partial_hazard = np.asarray(partial_hazard, dtype=float)
+    tenures = np.asarray(tenures).astype(int)
+    forward_months = int(forward_months)
+
+    remaining = np.zeros(len(tenures))
+    for lo in range(0, len(tenures), int(chunk_size)):
+        hi = min(lo + int(chunk_size), len(tenures))
+        t0 = tenures[lo:hi]
+        cols = np.arange(hi - lo)
+        sf = np.exp(-np.outer(baseline_cumhaz, partial_hazard[lo:hi]))
+        s_t0 = sf[t0, cols]
+        cum = np.cumsum(sf, axis=0, out=sf)  # reuse the block: only C is needed now
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rem = (cum[t0 + forward_months, cols] - cum[t0, cols]) / s_t0
+        remaining[lo:hi] = np.where(s_t0 > 1e-9, rem, 0.0)
+    return remaining
+
+
+def _factorize_rows(columns):
+    """Dense ids for the distinct rows of a set of equal-length columns.
+
+    Hash-factorizes column by column, folding each into the running row id —
+    O(n) per column, unlike the sort behind `np.unique(axis=0)`. NaN is a
+    value of its own (not the -1 sentinel, which would alias another row), so
+    a row with a missing covariate gets a pattern of its own.
+    """
+    ids = np.zeros(len(columns[0]), dtype=np.int64)
+    n_ids = 1
+    for col in columns:
+        codes, uniques = pd.factorize(col, use_na_sentinel=False)
+        ids, first = pd.factorize(ids * len(uniques) + codes)
+        n_ids = len(first)
+    return ids, n_ids
+
+
+def covariate_patterns(X, tenures):
+    """Collapse rows into unique covariate patterns and (pattern, tenure) pairs.
+
+    Returns (patterns, pair_pattern, pair_tenure, inverse): the unique design
+    rows, the pattern index and tenure of each unique pair (sorted by pattern),
+    and for every input row the index of its pair.
     """
-    remaining = pd.Series(index=df.index, dtype=float)
-    for _, group in df.groupby(group_col):
-        times, survival = kaplan_meier(group[duration_col], group[event_col])
-        remaining.loc[group.index] = [
-            expected_remaining_life(times, survival, tenure, forward_months)
-            for tenure in group[duration_col]
-        ]
+    tenures = np.asarray(tenures).astype(np.int64)
+    pattern_id, n_patterns = _factorize_rows(list(X.T))
+    patterns = np.empty((n_patterns, X.shape[1]))
+    patterns[pattern_id] = X
+    span = int(tenures.max()) + 1 if len(tenures) else 1
+    codes, pairs = pd.factorize(pattern_id * span + tenures)
+    order = np.argsort(pairs)  # only the unique pairs are sorted
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    pairs = pairs[order]
+    return patterns, pairs // span, (pairs % span).astype(int), rank[codes]
+
+
+def residual_life_by_pattern(
+    survival_block, n_patterns, pair_pattern, pair_tenure,
+    forward_months, chunk_size=50_000,
+) -> np.ndarray:
+    """Restricted mean residual life per (pattern, tenure) pair.
+
+    `survival_block(lo, hi)` returns the survival curves of patterns lo..hi-1
+    as a (grid x patterns) array on the integer month grid; pairs are sorted
+    by pattern. Each chunk of `chunk_size` curves is cumulated once and every
+    pair in it gathered, so work and memory scale with the number of
+    patterns, not customers.
+    """
+    pair_tenure = np.asarray(pair_tenure).astype(int)
+    forward_months = int(forward_months)
+
+    remaining = np.zeros(len(pair_tenure))
+    for lo in range(0, n_patterns, int(chunk_size)):
+        hi = min(lo + int(chunk_size), n_patterns)
+        rows = slice(*np.searchsorted(pair_pattern, [lo, hi]))
+        t0 = pair_tenure[rows]
+        cols = pair_pattern[rows] - lo
+        sf = survival_block(lo, hi)
+        s_t0 = sf[t0, cols]
+        cum = np.cumsum(sf, axis=0, out=sf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rem = (cum[t0 + forward_months, cols] - cum[t0, cols]) / s_t0
+        remaining[rows] = np.where(s_t0 > 1e-9, rem, 0.0)
     return remaining
 
 
+def ph_residual_life_by_pattern(
+    baseline_cumhaz, pattern_hazard, pair_pattern, pair_tenure,
+    forward_months, chunk_size=50_000,
+) -> np.ndarray:
+    """`ph_residual_life` with one survival curve per covariate pattern.
+
+    `pattern_hazard` holds the partial hazard of each unique pattern; the
+    residual life is evaluated once per (pattern, tenure) pair (see
+    `residual_life_by_pattern`).
+    """
+    baseline_cumhaz = np.asarray(baseline_cumhaz, dtype=float)
+    pattern_hazard = np.asarray(pattern_hazard, dtype=float)
+    return residual_life_by_pattern(
+        lambda lo, hi: np.exp(-np.outer(baseline_cumhaz, pattern_hazard[lo:hi])),
+        len(pattern_hazard), pair_pattern, pair_tenure, forward_months, chunk_size,
+    )
+
+
+class CoxConvergenceError(ValueError):
+    """The native Cox Newton-Raphson solver failed to converge."""
+
+
+def _cox_partial_likelihood(X, events, group, starts, tie_frac, beta, penalty):
+    """Penalized log partial likelihood, gradient and Hessian.
+
+    Rows are sorted by ascending duration; `group` is each row's tie group
+    (unique duration), `starts` the first row of each group and `tie_frac`
+    the Efron fraction l/d of each event within its group (all zero for
+    Breslow). Risk-set sums are reverse cumulative sums over the groups, and
+    the Hessian's sum of risk-set second moments collapses to a single
+    X' diag(q) X, so nothing larger than (n x k) is ever materialized.
+    """
+    eta = X @ beta
+    shift = eta.max()
+    w = np.exp(eta - shift)
+
+    def risk_sums(values):
+        per_group = np.add.reduceat(values, starts, axis=0)
+        return np.cumsum(per_group[::-1], axis=0)[::-1]
+
+    R0 = risk_sums(w)
+    R1 = risk_sums(w[:, None] * X)
+    ev = events.astype(bool)
+    g_ev = group[ev]
+    D0 = np.bincount(g_ev, weights=w[ev], minlength=len(starts))
+    D1 = np.zeros_like(R1)
+    if len(g_ev):  # event rows are sorted by group: sum each contiguous run
+        ev_groups, ev_starts = np.unique(g_ev, return_index=True)
+        D1[ev_groups] = np.add.reduceat(w[ev, None] * X[ev], ev_starts, axis=0)
+
+    phi = R0[g_ev] - tie_frac * D0[g_ev]
+    A = R1[g_ev] - tie_frac[:, None] * D1[g_ev]
+    inv_phi = 1.0 / phi
+
+    loglik = eta[ev].sum() - np.log(phi).sum() - shift * ev.sum()
+    grad = X[ev].sum(axis=0) - (A * inv_phi[:, None]).sum(axis=0)
+
+    # sum_g s0[g] * R2[g] = X' diag(w * cumsum(s0)[group]) X, and the tied
+    # event second moments D2 contribute only on event rows.
+    s0 = np.bincount(g_ev, weights=inv_phi, minlength=len(starts))
+    s1 = np.bincount(g_ev, weights=tie_frac * inv_phi, minlength=len(starts))
+    q = w * np.cumsum(s0)[group]
+    q[ev] -= w[ev] * s1[g_ev]
+    hess = -(X.T @ (q[:, None] * X)) + (A * inv_phi[:, None] ** 2).T @ A
+
+    loglik -= 0.5 * penalty * beta @ beta
+    grad -= penalty * beta
+    hess[np.diag_indices_from(hess)] -= penalty
+    return loglik, grad, hess
+
+
+def _newton_maximize(evaluate, theta, max_iter, tol, error, label):
+    """Newton-Raphson ascent with a step-halving line search.
+
+    `evaluate(theta)` returns (loglik, grad, hess) of a concave penalized
+    likelihood. A step is taken only if it does not lower the likelihood.
+    When no halving down to 1e-8 does, theta is kept: the fit stops there if
+    the predicted gain is at rounding level, and raises `error` otherwise.
+    Returns (theta, loglik).
+    """
+    loglik, grad, hess = evaluate(theta)
+    for _ in range(max_iter):
+        delta = np.linalg.solve(-hess, grad)
+        if np.abs(delta).max() < tol:
+            return theta, loglik
+        step = 1.0
+        while step >= 1e-8:
+            candidate = theta + step * delta
+            new = evaluate(candidate)
+            if new[0] >= loglik:
+                break
+            step /= 2
+        else:
+            if grad @ delta <= 1e-10 * abs(loglik):
+                return theta, loglik
+            raise error(f"{label} line search found no ascent step")
+        converged = new[0] - loglik <= tol * abs(loglik) and np.abs(step * delta).max() < 1e-6
+        theta, (loglik, grad, hess) = candidate, new
+        if converged:
+            return theta, loglik
+    raise error(f"{label} did not converge in {max_iter} iterations")
+
+
+def cox_ph_fit(
+    X, durations, events, penalizer=0.1, ties="efron", max_iter=50, tol=1e-9,
+) -> dict:
+    """Cox proportional-hazards fit in numpy (penalized Newton-Raphson).
+
+    Follows lifelines' parameterization so the two are interchangeable:
+    covariates are standardized, the L2 penalty is n * penalizer / 2 * |b|^2 on
+    the standardized coefficients, and the baseline cumulative hazard is the
+    Breslow estimator at every observed duration. `ties` is "efron" (the
+    lifelines default) or "breslow" (cheaper, slightly biased under heavy
+    ties). Returns params (original scale), norm_mean and the baseline.
+    """
+    if ties not in ("efron", "breslow"):
+        raise ValueError(f"ties must be 'efron' or 'breslow', got {ties!r}")
+    X = np.asarray(X, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    events = np.asarray(events).astype(bool)
+
+    order = np.argsort(durations, kind="stable")
+    X, durations, events = X[order], durations[order], events[order]
+    times, starts, group = np.unique(durations, return_index=True, return_inverse=True)
+    group = group.ravel()
+
+    norm_mean = X.mean(axis=0)
+    norm_std = X.std(axis=0, ddof=1)
+    norm_std[norm_std == 0] = 1.0
+    Z = (X - norm_mean) / norm_std
+
+    tie_frac = np.zeros(int(events.sum()))
+    if ties == "efron":
+        g_ev = group[events]
+        d = np.bincount(g_ev, minlength=len(times))
+        first = np.concatenate([[0], np.cumsum(d)[:-1]])
+        tie_frac = (np.arange(len(g_ev)) - first[g_ev]) / d[g_ev]
+
+    penalty = len(Z) * penalizer
+    beta, loglik = _newton_maximize(
+        lambda b: _cox_partial_likelihood(Z, events, group, starts, tie_frac, b, penalty),
+        np.zeros(Z.shape[1]), max_iter, tol, CoxConvergenceError, "Cox fit",
+    )
+
+    params = beta / norm_std
+    partial_hazard = np.exp((X - norm_mean) @ params)
+    at_risk = np.cumsum(np.add.reduceat(partial_hazard, starts)[::-1])[::-1]
+    deaths = np.bincount(group, weights=events, minlength=len(times))
+    return {
+        "params": params,
+        "norm_mean": norm_mean,
+        "baseline_times": times,
+        "baseline_cumhaz": np.cumsum(deaths / at_risk),
+        "log_likelihood": float(loglik),
+    }
+
+
+def _cox_levels(df, categorical_covariates) -> dict:
+    """Observed levels per categorical covariate, in sorted/dictionary order."""
+    levels = {}
+    for col in categorical_covariates:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            levels[col] = values.cat.remove_unused_categories().cat.categories.tolist()
+        else:
+            levels[col] = sorted(values.dropna().unique().tolist())
+    return levels
+
+
+def covariate_layout(df, numeric_covariates, categorical_covariates) -> dict:
+    """Covariate lists plus the (column, level) dummy layout observed in `df`."""
+    levels = _cox_levels(df, categorical_covariates)
+    return {
+        "numeric_covariates": list(numeric_covariates),
+        "categorical_covariates": list(categorical_covariates),
+        "dummy_columns": [(c, lvl) for c in categorical_covariates for lvl in levels[c][1:]],
+    }
+
+
+def reference_sample(layout, df, rows=5_000) -> pd.DataFrame:
+    """Training covariate sample kept with an artifact for drift checks."""
+    covariates = layout["numeric_covariates"] + layout["categorical_covariates"]
+    return df[covariates].sample(min(rows, len(df)), random_state=0).reset_index(drop=True)
+
+
+def cox_design_matrix(df, artifact) -> np.ndarray:
+    """Covariate matrix in the artifact's layout: numerics, then one indicator
+    per non-reference level (the `get_dummies(drop_first=True)` layout)."""
+    columns = [df[c].to_numpy(dtype=float) for c in artifact["numeric_covariates"]]
+    for col, level in artifact["dummy_columns"]:
+        columns.append(df[col].to_numpy() == level)
+    return np.column_stack(columns).astype(float)
+
+
+def _lifelines_fit(X, names, durations, events, penalizer) -> dict:
+    from lifelines import CoxPHFitter
+
+    fit_df = pd.DataFrame(X, columns=names).assign(_T=durations, _E=events)
+    cph = CoxPHFitter(penalizer=penalizer)
+    cph.fit(fit_df, duration_col="_T", event_col="_E")
+    baseline = cph.baseline_cumulative_hazard_.iloc[:, 0]
+    return {
+        "params": cph.params_.reindex(names).to_numpy(),
+        "norm_mean": cph._norm_mean.reindex(names).to_numpy(),
+        "baseline_times": baseline.index.to_numpy(dtype=float),
+        "baseline_cumhaz": baseline.to_numpy(dtype=float),
+    }
+
+
+def fit_cox_artifact(
+    df, numeric_covariates, categorical_covariates,
+    duration_col, event_col, penalizer=0.1, reference_rows=5_000,
+    fitter="lifelines",
+) -> dict:
+    """Fit a Cox PH model and reduce it to a plain, numpy-scorable artifact.
+
+    The artifact holds the coefficients, the training covariate means lifelines
+    centres on, the baseline cumulative hazard, and the dummy-column layout —
+    everything needed to score new customers in closed form without lifelines.
+    A sample of the training covariates is kept as the drift reference.
+    `fitter` is "lifelines" or "native" (`cox_ph_fit`, no lifelines import).
+    """
+    artifact = covariate_layout(df, numeric_covariates, categorical_covariates)
+    artifact.update({"penalizer": penalizer, "fitter": fitter})
+    names = list(numeric_covariates) + [f"{c}_{lvl}" for c, lvl in artifact["dummy_columns"]]
+    X = cox_design_matrix(df, artifact)
+    durations = df[duration_col].to_numpy()
+    events = df[event_col].to_numpy()
+    if fitter == "native":
+        fit = cox_ph_fit(X, durations, events, penalizer)
+    elif fitter == "lifelines":
+        fit = _lifelines_fit(X, names, durations, events, penalizer)
+    else:
+        raise ValueError(f"fitter must be 'lifelines' or 'native', got {fitter!r}")
+
+    artifact.update({
+        "params": fit["params"],
+        "norm_mean": fit["norm_mean"],
+        "baseline_times": np.asarray(fit["baseline_times"], dtype=float),
+        "baseline_cumhaz": np.asarray(fit["baseline_cumhaz"], dtype=float),
+        "reference": reference_sample(artifact, df, reference_rows),
+        "n_train": int(len(df)),
+    })
+    return artifact
+
+
+def score_cox_artifact(
+    artifact, df, duration_col, forward_months, chunk_size=50_000,
+    dedup=True, numeric_bins=None,
+) -> np.ndarray:
+    """Expected remaining months per customer from a fitted Cox artifact.
+
+    Closed form, numpy only: partial hazard exp((x - mean) . beta), baseline
+    cumulative hazard linearly interpolated onto the integer grid (as lifelines
+    does), then the chunked residual-life evaluation.
+
+    With `dedup`, customers sharing a covariate vector share one survival
+    curve and each (pattern, tenure) pair is evaluated once — exact, and
+    cheaper by the duplication factor. `numeric_bins` ({column: width})
+    optionally rounds numeric covariates to bin centres first, trading a
+    little precision for far fewer patterns.
+    """
+    X = cox_design_matrix(df, artifact)
+    for col, width in (numeric_bins or {}).items():
+        j = artifact["numeric_covariates"].index(col)
+        X[:, j] = (np.floor(X[:, j] / width) + 0.5) * width
+    tenures = df[duration_col].to_numpy()
+    max_t = int(tenures.max()) + int(forward_months)
+    h0 = np.interp(
+        np.arange(0, max_t + 1), artifact["baseline_times"], artifact["baseline_cumhaz"]
+    )
+    if not dedup:
+        partial_hazard = np.exp((X - artifact["norm_mean"]) @ artifact["params"])
+        return ph_residual_life(h0, partial_hazard, tenures, forward_months, chunk_size)
+
+    patterns, pair_pattern, pair_tenure, inverse = covariate_patterns(X, tenures)
+    pattern_hazard = np.exp((patterns - artifact["norm_mean"]) @ artifact["params"])
+    remaining = ph_residual_life_by_pattern(
+        h0, pattern_hazard, pair_pattern, pair_tenure, forward_months, chunk_size
+    )
+    return remaining[inverse]
+
+
+def save_cox_artifact(artifact, path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(artifact, path)
+    return path
+
+
+def load_cox_artifact(path) -> dict:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Survival artifact not found at {path} — run `python -m src.pipeline` first."
+        )
+    return joblib.load(path)
+
+
 def cox_expected_remaining(
     df, numeric_covariates, categorical_covariates,
-    duration_col, event_col, forward_months, penalizer=0.1,
+    duration_col, event_col, forward_months, penalizer=0.1, chunk_size=50_000,
+    fitter="lifelines",
 ) -> pd.Series:
     """Expected remaining months per customer from a Cox proportional-hazards fit.
 
@@ -96,33 +689,14 @@ def cox_expected_remaining(
     a fully individualized, statistically grounded expected lifetime. Remaining
     life is the restricted mean residual life over a forward window:
     sum over u in (tenure, tenure+forward] of S_i(u) / S_i(tenure).
-    """
-    from lifelines import CoxPHFitter
-
-    X = pd.get_dummies(
-        df[numeric_covariates + categorical_covariates],
-        columns=categorical_covariates, drop_first=True,
-    ).astype(float)
 
-    fit_df = X.copy()
-    fit_df[duration_col] = df[duration_col].to_numpy()
-    fit_df[event_col] = df[event_col].to_numpy()
-
-    cph = CoxPHFitter(penalizer=penalizer)
-    cph.fit(fit_df, duration_col=duration_col, event_col=event_col)
-
-    max_t = int(df[duration_col].max()) + int(forward_months)
-    times = np.arange(0, max_t + 1)
-    sf = cph.predict_survival_function(X, times=times).to_numpy()  # (len(times), n)
-
-    tenures = df[duration_col].to_numpy().astype(int)
-    remaining = np.zeros(len(df))
-    for j in range(len(df)):
-        t0 = tenures[j]
-        s_t0 = sf[t0, j] if t0 < len(times) else sf[-1, j]
-        if s_t0 <= 1e-9:
-            continue
-        hi = min(t0 + int(forward_months), max_t)
-        if hi > t0:
-            remaining[j] = float((sf[t0 + 1:hi + 1, j] / s_t0).sum())
+    Fits an artifact (`fit_cox_artifact`) and scores it (`score_cox_artifact`),
+    so peak memory is bounded by `chunk_size` customers rather than a dense
+    (times x n) survival matrix.
+    """
+    artifact = fit_cox_artifact(
+        df, numeric_covariates, categorical_covariates, duration_col, event_col,
+        penalizer, fitter=fitter,
+    )
+    remaining = score_cox_artifact(artifact, df, duration_col, forward_months, chunk_size)
     return pd.Series(remaining, index=df.index)
@@ -11,7 +11,6 @@ a Qini curve, showing that targeting by uplift captures more incremental
 responders than targeting by response propensity (the Telco-style approach).
 """
 
-import urllib.request
 from pathlib import Path
 
 import numpy as np
@@ -22,7 +21,8 @@ from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
 
-from src.config import HILLSTROM_PATH, HILLSTROM_URL
+from src.config import HILLSTROM_PATH, HILLSTROM_SHA256, HILLSTROM_URL
+from src.fetch import fetch
 
 NUMERIC = ["recency", "history", "mens", "womens", "newbie"]
 CATEGORICAL = ["history_segment", "zip_code", "channel"]
@@ -33,12 +33,7 @@ def load_hillstrom(dest: Path = HILLSTROM_PATH, url: str = HILLSTROM_URL, force=
 
     treat = any email sent (vs 'No E-Mail' control); outcome = site visit.
     """
-    dest = Path(dest)
-    if not dest.exists() or force:
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        tmp = dest.with_suffix(".tmp")
-        urllib.request.urlretrieve(url, tmp)
-        tmp.replace(dest)
+    dest = fetch(url, Path(dest), force=force, expected_sha256=HILLSTROM_SHA256)
 
     df = pd.read_csv(dest)
     df["treat"] = (df["segment"] != "No E-Mail").astype(int)
@@ -74,3 +74,29 @@ def scored_df():
         labels=["LOW", "MEDIUM", "HIGH"],
     ).astype(str)
     return df
+
+
+@pytest.fixture
+def population():
+    """Factory of synthetic customer frames with the survival covariates,
+    for CLV tests: population(n, seed, charge_scale)."""
+
+    def make(n=400, seed=0, charge_scale=1.0):
+        rng = np.random.default_rng(seed)
+        contract = rng.choice(["Month-to-month", "One year", "Two year"], n)
+        df = pd.DataFrame({
+            "tenure": rng.integers(0, 72, n),
+            "MonthlyCharges": rng.uniform(20, 110, n) * charge_scale,
+            "Contract": contract,
+            "InternetService": rng.choice(["DSL", "Fiber optic", "No"], n),
+            "PaymentMethod": rng.choice(["Electronic check", "Mailed check"], n),
+            "PaperlessBilling": rng.choice(["No", "Yes"], n),
+            "Partner": rng.choice(["No", "Yes"], n),
+            "Dependents": rng.choice(["No", "Yes"], n),
+        })
+        df["TotalCharges"] = df["MonthlyCharges"] * df["tenure"]
+        p = 0.1 + 0.3 * (df["Contract"] == "Month-to-month")
+        df["churned"] = (rng.uniform(0, 1, n) < p).astype(int)
+        return df
+
+    return make
@@ -0,0 +1,62 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.batch_scoring import load_scores, score_to_sqlite
+from src.economics import add_economic_fields
+from src.features.feature_builder import FEATURES, build_feature_table
+from src.ingest import clean_telco_data
+from src.load_to_sqlite import load_to_sqlite
+from src.models.train_logistic import build_pipeline, compile_model
+
+
+@pytest.fixture
+def scored_db(raw_telco_df, tmp_path):
+    db_path = tmp_path / "test.db"
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    load_to_sqlite(customers, db_path, mode="bulk")
+    pipeline = build_pipeline().fit(customers[FEATURES], customers["churned"])
+    return db_path, pipeline
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_chunked_scores_match_the_model(scored_db, max_workers):
+    db_path, pipeline = scored_db
+    result = score_to_sqlite(
+        db_path, chunk_rows=5, max_workers=max_workers, compiled=compile_model(pipeline)
+    )
+    assert (result["rows"], result["chunks"]) == (12, 3)
+
+    features = build_feature_table(db_path).set_index("customer_id")
+    scores = load_scores(db_path).set_index("customer_id").loc[features.index]
+    expected = pipeline.predict_proba(features[FEATURES])[:, 1]
+    assert np.abs(scores["churn_probability"].to_numpy() - expected).max() < 1e-9
+    bands = np.select([expected >= 0.60, expected >= 0.30], ["HIGH", "MEDIUM"], "LOW")
+    assert scores["risk_band"].astype(str).tolist() == bands.tolist()
+
+
+def test_rescoring_replaces_the_table(scored_db):
+    db_path, pipeline = scored_db
+    compiled = compile_model(pipeline)
+    score_to_sqlite(db_path, chunk_rows=4, max_workers=1, compiled=compiled)
+    score_to_sqlite(db_path, chunk_rows=100, max_workers=1, compiled=compiled)
+    with sqlite3.connect(db_path) as conn:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 12
+    assert "scores_new" not in tables
+
+
+def test_scores_a_database_whose_path_needs_uri_escaping(raw_telco_df, tmp_path):
+    db_path = tmp_path / "q?a#b%20c" / "test.db"
+    db_path.parent.mkdir()
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    load_to_sqlite(customers, db_path, mode="bulk")
+    pipeline = build_pipeline().fit(customers[FEATURES], customers["churned"])
+    result = score_to_sqlite(db_path, max_workers=1, compiled=compile_model(pipeline))
+    assert result["rows"] == len(load_scores(db_path)) == 12
+
+
+def test_missing_database_raises(tmp_path):
+    with pytest.raises(FileNotFoundError, match="src.pipeline"):
+        score_to_sqlite(tmp_path / "nope.db", compiled={})
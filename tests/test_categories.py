@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.categories import (
+    CATEGORY_DOMAINS,
+    compact_categoricals,
+    decode_categoricals,
+    memory_report,
+)
+from src.ingest import clean_telco_data
+
+
+def test_clean_frame_uses_shared_dictionaries(raw_telco_df):
+    cleaned = clean_telco_data(raw_telco_df)
+    for col in CATEGORY_DOMAINS.keys() & set(cleaned.columns):
+        assert list(cleaned[col].cat.categories) == CATEGORY_DOMAINS[col]
+    assert cleaned["churned"].dtype == "int8"
+
+    # decoding gives back exactly the original strings
+    decoded = decode_categoricals(cleaned)
+    assert decoded["Contract"].tolist() == raw_telco_df["Contract"].tolist()
+
+
+def test_unknown_values_are_kept_not_dropped():
+    df = pd.DataFrame({"Contract": ["One year", "Three year", "Two year"]})
+    compact = compact_categoricals(df)
+    assert compact["Contract"].tolist() == df["Contract"].tolist()
+    assert list(compact["Contract"].cat.categories)[-1] == "Three year"
+
+
+def test_memory_report_shows_reduction(raw_telco_df):
+    big = pd.concat([raw_telco_df] * 50, ignore_index=True)
+    big["customerID"] = [f"C-{i}" for i in range(len(big))]
+    report = memory_report({"ingest": clean_telco_data(big)})
+    assert report.loc[0, "compact_mb"] < report.loc[0, "object_mb"]
+    assert report.loc[0, "reduction"] > 1.5
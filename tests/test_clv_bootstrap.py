@@ -0,0 +1,109 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.clv_bootstrap import bootstrap_clv
+from src.config import CLV_HORIZON_MONTHS
+from src.survival import expected_remaining_by_group
+
+
+def test_km_point_estimate_matches_economics_fallback(population):
+    df = population(n=300)
+    out = bootstrap_clv(df, n_replicates=20, max_workers=1)
+    remaining = expected_remaining_by_group(
+        df, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS
+    )
+    np.testing.assert_allclose(out["CLV"], remaining * df["MonthlyCharges"])
+    assert (out["CLV_p05"] <= out["CLV_p50"]).all()
+    assert (out["CLV_p50"] <= out["CLV_p95"]).all()
+
+
+def test_bootstrap_reproducible_across_worker_counts(population):
+    df = population(n=300)
+    serial = bootstrap_clv(df, n_replicates=40, seed=7, max_workers=1)
+    pooled = bootstrap_clv(df, n_replicates=40, seed=7, max_workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    other = bootstrap_clv(df, n_replicates=40, seed=8, max_workers=1)
+    assert not np.allclose(serial["CLV_p95"], other["CLV_p95"])
+
+
+def test_group_intervals_bracket_point_mean(population):
+    df = population(n=600)
+    out = bootstrap_clv(df, n_replicates=200, by="group", max_workers=1)
+    assert list(out["Contract"]) == ["Month-to-month", "One year", "Two year"]
+    assert out["customers"].sum() == len(df)
+    assert (out["CLV_p05"] < out["CLV_mean"]).all()
+    assert (out["CLV_mean"] < out["CLV_p95"]).all()
+
+
+def test_cox_bootstrap_per_customer(population):
+    df = population(n=200)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = bootstrap_clv(df, n_replicates=6, method="cox", max_workers=1)
+    assert list(out.columns) == ["CLV", "CLV_p05", "CLV_p50", "CLV_p95"]
+    assert out.notna().all().all()
+    assert (out["CLV_p05"] <= out["CLV_p95"]).all()
+
+
+def test_rejects_unknown_method(population):
+    with pytest.raises(ValueError, match="method"):
+        bootstrap_clv(population(), method="weibull")
+
+
+def test_cox_group_bootstrap_and_dropped_replicates(monkeypatch, population):
+    import src.clv_bootstrap as bootstrap
+    from src.survival import CoxConvergenceError
+
+    df = population(n=200)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        full = bootstrap_clv(df, n_replicates=6, method="cox", by="group", max_workers=1)
+    assert full["customers"].sum() == len(df)
+    assert (full["CLV_p05"] <= full["CLV_p95"]).all()
+
+    fit = bootstrap.fit_cox_artifact
+    calls = []
+
+    def flaky_fit(*args, **kwargs):
+        calls.append(1)
+        if len(calls) in (3, 5):  # the point fit is call 1
+            raise CoxConvergenceError("did not converge")
+        return fit(*args, **kwargs)
+
+    monkeypatch.setattr(bootstrap, "fit_cox_artifact", flaky_fit)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = bootstrap_clv(df, n_replicates=6, method="cox", by="group", max_workers=1)
+    assert out[["CLV_p05", "CLV_p50", "CLV_p95"]].notna().all().all()
+    pd.testing.assert_series_equal(out["CLV_mean"], full["CLV_mean"])
+
+    def only_point_fit(*args, **kwargs):
+        calls.append(1)
+        if len(calls) > 1:
+            raise CoxConvergenceError("did not converge")
+        return fit(*args, **kwargs)
+
+    calls.clear()
+    monkeypatch.setattr(bootstrap, "fit_cox_artifact", only_point_fit)
+    with pytest.raises(CoxConvergenceError, match="No Cox fit converged"):
+        bootstrap_clv(df, n_replicates=3, method="cox", by="group", max_workers=1)
+
+
+def test_rejects_empty_bootstrap(population):
+    with pytest.raises(ValueError, match="n_replicates"):
+        bootstrap_clv(population(), n_replicates=0)
+
+
+def test_cox_customer_quantiles_independent_of_chunking(monkeypatch, population):
+    import src.clv_bootstrap as bootstrap
+
+    df = population(n=150)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        whole = bootstrap_clv(df, n_replicates=5, method="cox", max_workers=1)
+        monkeypatch.setattr(bootstrap, "_QUANTILE_CELLS", 5 * 7)  # 7-customer chunks
+        chunked = bootstrap_clv(df, n_replicates=5, method="cox", max_workers=1)
+    pd.testing.assert_frame_equal(chunked, whole)
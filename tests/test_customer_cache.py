@@ -0,0 +1,128 @@
+import pandas as pd
+import pytest
+
+from src.customer_cache import (
+    OFFER_KEYS,
+    SURVIVAL_KEYS,
+    cache_key,
+    layer_key,
+    load_customers,
+    load_customers_and_survival,
+    load_table,
+)
+from src.economics import add_economic_fields
+from src.ingest import clean_telco_data
+
+
+@pytest.fixture
+def raw_path(raw_telco_df, tmp_path):
+    path = tmp_path / "raw.csv"
+    raw_telco_df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def survival_path(tmp_path):
+    """Keep the survival artifact out of data/models."""
+    return tmp_path / "models" / "cox.joblib"
+
+
+def test_cache_round_trip_preserves_table(raw_path, tmp_path, survival_path):
+    cache_dir = tmp_path / "cache"
+
+    cold = load_customers(raw_path, cache_dir, survival_path=survival_path)
+    warm = load_customers(raw_path, cache_dir, survival_path=survival_path)
+
+    assert load_table(cache_key(raw_path), cache_dir / "clean") is not None
+    pd.testing.assert_frame_equal(warm, cold)
+    expected = add_economic_fields(clean_telco_data(pd.read_csv(raw_path)))
+    pd.testing.assert_frame_equal(cold, expected, check_dtype=False)
+
+
+def test_layer_keys_depend_only_on_their_inputs(raw_telco_df, raw_path, monkeypatch):
+    from src import config
+
+    clean = cache_key(raw_path)
+    survival, offer = layer_key(clean, SURVIVAL_KEYS), layer_key(clean, OFFER_KEYS)
+
+    monkeypatch.setattr(config, "OFFER_MONTHS", config.OFFER_MONTHS + 1)
+    assert layer_key(clean, OFFER_KEYS) != offer
+    assert layer_key(clean, SURVIVAL_KEYS) == survival
+    monkeypatch.undo()
+
+    monkeypatch.setattr(config, "CLV_HORIZON_MONTHS", 24)
+    assert layer_key(clean, SURVIVAL_KEYS) != survival
+    assert layer_key(clean, OFFER_KEYS) == offer
+    monkeypatch.undo()
+
+    raw_telco_df.iloc[1:].to_csv(raw_path, index=False)
+    assert cache_key(raw_path) != clean
+
+
+def test_offer_change_recomputes_only_the_cost_layer(
+    raw_path, tmp_path, survival_path, monkeypatch
+):
+    from src import config, economics, ingest
+
+    cache_dir = tmp_path / "cache"
+    before = load_customers(raw_path, cache_dir, survival_path=survival_path)
+
+    def must_not_run(*args, **kwargs):
+        raise AssertionError("survival / parsing should be served from cache")
+
+    monkeypatch.setattr(economics, "survival_results", must_not_run)
+    monkeypatch.setattr(ingest, "load_clean_telco_data", must_not_run)
+    monkeypatch.setattr(config, "DISCOUNT_RATE", config.DISCOUNT_RATE * 2)
+    after = load_customers(raw_path, cache_dir, survival_path=survival_path)
+
+    pd.testing.assert_series_equal(after["CLV"], before["CLV"])
+    expected = economics.offer_cost(
+        after, config.OUTREACH_COST, config.DISCOUNT_RATE, config.OFFER_MONTHS
+    )
+    assert (after["retention_cost"] > before["retention_cost"]).all()
+    assert (after["retention_cost"] - expected).abs().max() < 1e-9
+
+
+def test_survival_results_computed_once_and_served_from_cache(
+    raw_path, tmp_path, survival_path, monkeypatch
+):
+    from src import economics
+
+    calls = []
+    real = economics.survival_results
+    monkeypatch.setattr(
+        economics, "survival_results", lambda *a, **k: calls.append(1) or real(*a, **k)
+    )
+    cache_dir = tmp_path / "cache"
+    cold, cold_survival = load_customers_and_survival(
+        raw_path, cache_dir, survival_path=survival_path
+    )
+    warm, warm_survival = load_customers_and_survival(
+        raw_path, cache_dir, survival_path=survival_path
+    )
+
+    assert len(calls) == 1
+    assert warm_survival.method == cold_survival.method
+    pd.testing.assert_series_equal(warm_survival.km_remaining, cold_survival.km_remaining)
+    assert (warm["CLV"] == warm["MonthlyCharges"] * warm_survival.remaining).all()
+    for label, (times, survival) in cold_survival.km_curves.items():
+        cached_times, cached_survival = warm_survival.km_curves[label]
+        assert (cached_times == times).all() and (cached_survival == survival).all()
+
+
+def test_layered_write_prunes_single_table_entries(raw_path, tmp_path, survival_path):
+    from src.customer_cache import save_table
+
+    cache_dir = tmp_path / "cache"
+    old = save_table(pd.DataFrame({"x": [1, 2]}), "0" * 64, cache_dir)
+    (cache_dir / f".{'1' * 64}.tmp").mkdir()
+
+    load_customers(raw_path, cache_dir, survival_path=survival_path)
+    assert not old.exists()
+    assert sorted(p.name for p in cache_dir.iterdir()) == [
+        "clean", "clv", "cost", "remaining"
+    ]
+
+
+def test_miss_returns_none(tmp_path):
+    assert load_table("deadbeef", tmp_path) is None
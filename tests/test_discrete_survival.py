@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from src.discrete_survival import (
+    discrete_expected_remaining,
+    discrete_hazard_fit,
+    fit_discrete_artifact,
+    score_discrete_artifact,
+)
+
+
+def _person_period_fit(X, T, E, penalizer):
+    """Reference: the same model fitted on the explicit person-period table."""
+    mean, std = X.mean(0), X.std(0, ddof=1)
+    Z = (X - mean) / std
+    months = np.flatnonzero(np.bincount(T, weights=E))
+    idx = np.repeat(np.arange(len(T)), T + 1)
+    t = np.concatenate([np.arange(x + 1) for x in T])
+    y = (E[idx] == 1) & (t == T[idx])
+    keep = np.isin(t, months)
+    idx, t, y = idx[keep], t[keep], y[keep]
+    D = np.hstack([(t[:, None] == months[None, :]).astype(float), Z[idx]])
+    m, penalty = len(months), len(T) * penalizer
+
+    def objective(theta):
+        z = D @ theta
+        p = 1 / (1 + np.exp(-z))
+        ll = y @ z - np.logaddexp(0, z).sum() - 0.5 * penalty * theta[m:] @ theta[m:]
+        g = D.T @ (y - p)
+        g[m:] -= penalty * theta[m:]
+        return -ll, -g
+
+    res = minimize(objective, np.zeros(D.shape[1]), jac=True, method="L-BFGS-B",
+                   options={"maxiter": 5000, "gtol": 1e-10, "ftol": 1e-15})
+    return res.x[:m], res.x[m:] / std, months
+
+
+def _customers(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 40, n),
+        "MonthlyCharges": rng.uniform(20, 110, n).round(0),
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+    })
+    p = 0.1 + 0.35 * (df["Contract"] == "Month-to-month")
+    df["churned"] = (rng.uniform(0, 1, n) < p).astype(int)
+    return df
+
+
+def test_aggregated_fit_matches_person_period_table():
+    rng = np.random.default_rng(1)
+    n = 400
+    X = np.column_stack([
+        rng.normal(size=n), rng.integers(0, 2, n), rng.integers(0, 2, n)
+    ]).astype(float)
+    T = rng.integers(0, 25, n)
+    E = (rng.uniform(size=n) < 0.25 + 0.2 * X[:, 1]).astype(int)
+
+    alpha, params, months = _person_period_fit(X, T, E, 0.1)
+    fit = discrete_hazard_fit(X, T, E, 0.1)
+
+    assert np.allclose(fit["params"], params, atol=1e-6)
+    assert np.allclose(fit["alpha"][months], alpha, atol=1e-5)
+    no_churn = np.setdiff1d(np.arange(T.max() + 1), months)
+    assert np.isneginf(fit["alpha"][no_churn]).all()
+
+
+def test_discrete_remaining_life_is_individualized_and_bounded():
+    df = _customers()
+    rem = discrete_expected_remaining(
+        df, ["MonthlyCharges"], ["Contract"], "tenure", "churned", 24
+    )
+    assert rem.notna().all() and (rem > 0).all() and (rem <= 24 + 1e-9).all()
+    by_contract = rem.groupby(df["Contract"]).mean()
+    assert by_contract["Two year"] > by_contract["Month-to-month"]
+    assert rem[df["Contract"] == "Month-to-month"].std() > 0
+
+
+def test_discrete_artifact_scores_new_customers_past_training_range():
+    df = _customers(seed=2)
+    artifact = fit_discrete_artifact(df, ["MonthlyCharges"], ["Contract"], "tenure", "churned")
+    new = df.head(4).assign(tenure=[0, 10, 39, 80])
+    rem = score_discrete_artifact(artifact, new, "tenure", 24)
+    assert np.isfinite(rem).all()
+    assert np.isclose(rem[3], 24.0)  # no churn observed past month 39: flat survival
+
+
+def test_discrete_missing_covariate_does_not_alias_other_patterns():
+    df = _customers(seed=3)
+    rng = np.random.default_rng(3)
+    df["MonthlyCharges"] = rng.choice([30.0, 70.0], len(df))
+    df["SupportCalls"] = rng.choice([0.0, 1.0], len(df))
+    numeric = ["MonthlyCharges", "SupportCalls"]
+    artifact = fit_discrete_artifact(df, numeric, ["Contract"], "tenure", "churned")
+    clean = score_discrete_artifact(artifact, df, "tenure", 24)
+    # the second-seen charge with a missing call count: the old -1 sentinel
+    # folded it onto the first-seen charge's pattern
+    row = int(np.flatnonzero(df["MonthlyCharges"] != df["MonthlyCharges"].iloc[0])[0])
+    missing = df.assign(SupportCalls=df["SupportCalls"].where(df.index != row))
+    rem = score_discrete_artifact(artifact, missing, "tenure", 24)
+    alone = score_discrete_artifact(artifact, missing.iloc[[row]], "tenure", 24)
+    assert np.array_equal(rem[[row]], alone)
+    others = np.arange(len(df)) != row
+    assert np.array_equal(rem[others], clean[others])
@@ -1,5 +1,16 @@
-from src.economics import add_economic_fields
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.config import CLV_HORIZON_MONTHS, OUTREACH_COST
+from src.economics import (
+    add_economic_fields,
+    load_or_fit_survival_artifact,
+    survival_results,
+)
 from src.ingest import clean_telco_data
+from src.survival import expected_remaining_by_group
 
 
 def _enriched(raw_telco_df):
@@ -10,7 +21,7 @@ def test_retention_cost_varies_within_plan(raw_telco_df):
     """Regression: the old generator gave every customer on a plan the
     identical retention cost, breaking the efficiency ranking."""
     df = _enriched(raw_telco_df)
-    for plan, group in df.groupby("plan"):
+    for plan, group in df.groupby("plan", observed=True):
         if len(group) > 1:
             assert group["retention_cost"].nunique() > 1, (
                 f"retention_cost is constant within plan {plan!r}"
@@ -32,7 +43,7 @@ def test_two_year_clv_exceeds_month_to_month(raw_telco_df):
     df = _enriched(raw_telco_df)
     # Two-year customers churn less, so their KM-derived expected remaining
     # lifetime (CLV per unit MRR) should be higher on average.
-    per_mrr = (df["CLV"] / df["MRR"]).groupby(df["plan"]).mean()
+    per_mrr = (df["CLV"] / df["MRR"]).groupby(df["plan"], observed=True).mean()
     assert per_mrr["Two year"] > per_mrr["Month-to-month"]
 
 
@@ -40,3 +51,115 @@ def test_contract_columns_present(raw_telco_df):
     df = _enriched(raw_telco_df)
     for col in ["plan", "MRR", "CLV", "retention_cost", "churned", "customer_id"]:
         assert col in df.columns
+
+
+def test_survival_artifact_reused_until_drift(tmp_path, population):
+    path = tmp_path / "cox.joblib"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        first = load_or_fit_survival_artifact(population(seed=0), path)
+        assert first is not None and path.exists()
+
+        # same population, fresh sample: the saved fit is reused
+        same = load_or_fit_survival_artifact(population(seed=1), path)
+        assert same["n_train"] == first["n_train"]
+        assert np.array_equal(same["params"], first["params"])
+
+        # a price hike drifts MonthlyCharges: refit on the new population
+        drifted = population(n=500, seed=2, charge_scale=1.5)
+        refit = load_or_fit_survival_artifact(drifted, path)
+        assert refit["n_train"] == 500
+
+        forced = load_or_fit_survival_artifact(population(n=450, seed=3), path, refit=True)
+        assert forced["n_train"] == 450
+
+        # a batch too small to test for drift reuses the saved fit
+        small = load_or_fit_survival_artifact(population(n=12, seed=4), path)
+        assert small is not None and small["n_train"] == 450
+
+
+def test_survival_fit_falls_back_only_on_expected_failures(
+    tmp_path, monkeypatch, population, caplog
+):
+    import pytest
+
+    import src.economics as economics
+    from src.survival import CoxConvergenceError
+
+    def diverge(df):
+        raise CoxConvergenceError("did not converge")
+
+    monkeypatch.setattr(economics, "_fit_artifact", diverge)
+    with caplog.at_level("WARNING", logger="economics"):
+        assert load_or_fit_survival_artifact(population(), tmp_path / "cox.joblib") is None
+    assert "falling back to Kaplan-Meier" in caplog.text
+
+    def broken(df):
+        raise KeyError("MonthlyCharges")
+
+    monkeypatch.setattr(economics, "_fit_artifact", broken)
+    with pytest.raises(KeyError):
+        load_or_fit_survival_artifact(population(), tmp_path / "cox.joblib")
+
+
+def test_clv_scored_from_artifact_matches_fresh_fit(tmp_path, population):
+    df = population(seed=4)
+    df["MonthlyCharges"] = df["MonthlyCharges"].round(2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fresh = add_economic_fields(df)
+        artifact = load_or_fit_survival_artifact(df, tmp_path / "cox.joblib")
+        scored = add_economic_fields(df, survival_artifact=artifact)
+    assert np.allclose(scored["CLV"], fresh["CLV"], atol=1e-9)
+
+
+def test_discrete_clv_method_scores_every_customer(monkeypatch, population):
+    import src.economics as economics
+
+    monkeypatch.setattr(economics, "CLV_METHOD", "discrete")
+    df = population(seed=5)
+    enriched = add_economic_fields(df)
+    assert (enriched["CLV"] > 0).all()
+    assert enriched["CLV"].groupby(df["Contract"]).std().min() > 0
+
+
+def test_reprice_scored_changes_only_cost_columns(scored_df):
+    from app.core import reprice_scored
+
+    scored = scored_df.assign(
+        Contract=["Month-to-month", "One year"] * 25, MonthlyCharges=70.0
+    )
+    repriced = reprice_scored(scored, discount_rate=0.0, offer_months=1)
+    outreach = scored["Contract"].map(OUTREACH_COST)
+    assert (repriced["retention_cost"] == outreach).all()
+    assert (
+        repriced["loss_if_act"]
+        == (1 - scored["churn_probability"]) * repriced["retention_cost"]
+    ).all()
+    pd.testing.assert_series_equal(repriced["CLV"], scored["CLV"])
+
+
+def test_survival_results_hold_model_and_km_from_one_pass(population):
+    df = population()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = survival_results(df)
+    km = expected_remaining_by_group(
+        df, "Contract", "tenure", "churned", CLV_HORIZON_MONTHS
+    )
+    assert results.method == "cox"
+    assert results.meta["n_train"] == len(df)
+    assert results.remaining is results.model_remaining
+    assert set(results.km_curves) == {"Month-to-month", "One year", "Two year"}
+    pd.testing.assert_series_equal(results.km_remaining, km)
+
+    enriched = add_economic_fields(df, survival=results)
+    np.testing.assert_allclose(
+        enriched["CLV"], df["MonthlyCharges"] * results.model_remaining
+    )
+
+
+def test_survival_results_fall_back_to_km_on_small_samples(raw_telco_df):
+    results = survival_results(clean_telco_data(raw_telco_df))
+    assert results.method == "km" and results.model_remaining is None
+    assert results.remaining is results.km_remaining
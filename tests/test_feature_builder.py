@@ -1,5 +1,10 @@
 from src.economics import add_economic_fields
-from src.features.feature_builder import CONTRACT_COLUMNS, FEATURES, build_feature_table
+from src.features.feature_builder import (
+    CATEGORICAL_FEATURES,
+    CONTRACT_COLUMNS,
+    FEATURES,
+    build_feature_table,
+)
 from src.ingest import clean_telco_data
 from src.load_to_sqlite import load_to_sqlite
 
@@ -16,8 +21,140 @@ def test_sqlite_round_trip(raw_telco_df, tmp_path):
         assert col in features.columns, f"missing column {col}"
 
 
+def test_feature_table_is_projected_and_typed(raw_telco_df, tmp_path):
+    db_path = tmp_path / "test.db"
+    load_to_sqlite(add_economic_fields(clean_telco_data(raw_telco_df)), db_path)
+
+    features = build_feature_table(db_path)
+    assert list(features.columns) == CONTRACT_COLUMNS + FEATURES
+    assert features["Contract"].dtype == "category"
+    assert features["MonthlyCharges"].dtype == "float64"
+
+    arrays = build_feature_table(db_path, as_arrays=True)
+    assert arrays["numeric"].shape == (len(raw_telco_df), 3)
+    assert arrays["codes"].shape == (len(raw_telco_df), 16)
+    contract = arrays["categories"]["Contract"]
+    decoded = [contract[i] for i in arrays["codes"][:, CATEGORICAL_FEATURES.index("Contract")]]
+    assert decoded == features["Contract"].tolist()
+
+
 def test_missing_db_raises(tmp_path):
     import pytest
 
     with pytest.raises(FileNotFoundError):
         build_feature_table(tmp_path / "does_not_exist.db")
+
+
+def test_upsert_applies_only_the_delta(raw_telco_df, tmp_path):
+    import sqlite3
+
+    import pandas as pd
+
+    db_path = tmp_path / "test.db"
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    first = load_to_sqlite(customers, db_path, mode="upsert")
+    assert first == {"inserted": len(customers), "updated": 0, "deleted": 0}
+
+    # no changes -> no writes
+    assert load_to_sqlite(customers, db_path, mode="upsert") == {
+        "inserted": 0, "updated": 0, "deleted": 0,
+    }
+
+    changed = customers.copy()
+    changed.loc[changed["customer_id"] == "A-2", "MRR"] = 999.0
+    changed = changed[changed["customer_id"] != "A-3"]
+    new_row = changed[changed["customer_id"] == "A-4"].assign(customer_id="A-99")
+    changed = pd.concat([changed, new_row], ignore_index=True)
+
+    counts = load_to_sqlite(changed, db_path, mode="upsert")
+    assert counts == {"inserted": 1, "updated": 1, "deleted": 1}
+
+    with sqlite3.connect(db_path) as conn:
+        ids = {r[0] for r in conn.execute("SELECT customer_id FROM customers")}
+        mrr = conn.execute(
+            "SELECT MRR FROM customers WHERE customer_id = 'A-2'"
+        ).fetchone()[0]
+    assert ids == set(changed["customer_id"])
+    assert mrr == 999.0
+
+
+def test_bulk_load_round_trip_with_indexes(raw_telco_df, tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "bulk.db"
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    load_to_sqlite(customers, db_path, mode="bulk")
+
+    features = build_feature_table(db_path)
+    assert len(features) == len(customers)
+
+    with sqlite3.connect(db_path) as conn:
+        types = {r[1]: r[2] for r in conn.execute("PRAGMA table_info(customers)")}
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list(customers)")}
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM customers WHERE customer_id = 'A-1'"
+        ).fetchall()
+    assert types["tenure"] == "INTEGER" and types["CLV"] == "REAL"
+    assert types["Contract"] == "TEXT"
+    assert {"idx_customers_customer_id", "idx_customers_segment"} <= indexes
+    assert "idx_customers_customer_id" in str(plan)
+
+
+def test_segment_stats_track_delta_loads(raw_telco_df, tmp_path):
+    import pandas as pd
+
+    from src.sql_feature_queries import churn_summary_by_segment
+
+    def expected(df):
+        g = df.groupby(["Contract", "InternetService"], observed=True)
+        out = pd.DataFrame({
+            "customers": g.size(),
+            "churn_rate": g["churned"].mean().round(3),
+            "avg_mrr": g["MRR"].mean().round(2),
+            "avg_clv": g["CLV"].mean().round(2),
+        }).reset_index()
+        return out.astype({"Contract": str, "InternetService": str})
+
+    def summary(db):
+        return churn_summary_by_segment(db).sort_values(
+            ["Contract", "InternetService"]
+        ).reset_index(drop=True)
+
+    db_path = tmp_path / "test.db"
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    load_to_sqlite(customers, db_path, mode="bulk")
+    pd.testing.assert_frame_equal(summary(db_path), expected(customers))
+
+    # move a customer to a new segment, drop one, churn another
+    changed = customers.copy()
+    changed["InternetService"] = changed["InternetService"].astype(str)
+    changed.loc[changed["customer_id"] == "A-1", "InternetService"] = "DSL"
+    changed.loc[changed["customer_id"] == "A-3", "churned"] = 1
+    changed = changed[changed["customer_id"] != "A-7"]
+    load_to_sqlite(changed, db_path, mode="upsert")
+    pd.testing.assert_frame_equal(summary(db_path), expected(changed))
+
+
+def test_update_columns_rewrites_costs_in_place(raw_telco_df, tmp_path):
+    import sqlite3
+
+    from src.load_to_sqlite import update_columns
+
+    db_path = tmp_path / "test.db"
+    customers = add_economic_fields(clean_telco_data(raw_telco_df))
+    load_to_sqlite(customers, db_path, mode="upsert")
+    with sqlite3.connect(db_path) as conn:
+        segments = conn.execute("SELECT * FROM segment_stats ORDER BY 1, 2").fetchall()
+
+    repriced = customers.assign(retention_cost=customers["retention_cost"] + 10)
+    assert update_columns(repriced, ["retention_cost"], db_path) == len(customers)
+
+    features = build_feature_table(db_path).set_index("customer_id")
+    expected = repriced.set_index("customer_id")["retention_cost"]
+    assert (features["retention_cost"] == expected.loc[features.index]).all()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT * FROM segment_stats ORDER BY 1, 2").fetchall() == segments
+    # fingerprints were refreshed: the next delta load sees nothing to do
+    assert load_to_sqlite(repriced, db_path, mode="upsert") == {
+        "inserted": 0, "updated": 0, "deleted": 0,
+    }
@@ -0,0 +1,119 @@
+"""Fetch-layer tests against a local HTTP stand-in (no network)."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.fetch import ChecksumMismatchError, fetch
+
+
+class _Server:
+    """Serves one in-memory file with ETag, conditional and Range support."""
+
+    def __init__(self, body: bytes, etag: str = '"v1"'):
+        self.body, self.etag, self.requests = body, etag, []
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                outer.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == outer.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body, status = outer.body, 200
+                rng = self.headers.get("Range")
+                if rng and self.headers.get("If-Range", outer.etag) == outer.etag:
+                    start = int(rng.split("=")[1].rstrip("-"))
+                    body, status = outer.body[start:], 206
+                self.send_response(status)
+                self.send_header("ETag", outer.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/data.csv"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def server():
+    srv = _Server(b"customerID,tenure\n" + b"".join(
+        f"C-{i},{i % 72}\n".encode() for i in range(5000)
+    ))
+    yield srv
+    srv.httpd.shutdown()
+
+
+def _paths(tmp_path):
+    return tmp_path / "data.csv", tmp_path / "manifest.json"
+
+
+def test_download_records_checksum_and_serves_cache(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    fetch(server.url, dest, manifest_path=manifest)
+    assert dest.read_bytes() == server.body
+    recorded = json.loads(manifest.read_text())["data.csv"]
+    assert recorded["sha256"] == hashlib.sha256(server.body).hexdigest()
+    assert recorded["etag"] == server.etag
+
+    fetch(server.url, dest, manifest_path=manifest)  # cached: no request
+    assert len(server.requests) == 1
+
+
+def test_forced_refresh_of_unchanged_file_is_conditional(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    fetch(server.url, dest, manifest_path=manifest)
+    fetch(server.url, dest, force=True, manifest_path=manifest)
+
+    assert server.requests[-1]["If-None-Match"] == server.etag
+    assert dest.read_bytes() == server.body
+
+
+def test_interrupted_download_resumes_with_range(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    half = len(server.body) // 2
+    dest.with_suffix(".tmp").write_bytes(server.body[:half])
+    manifest.write_text(json.dumps({
+        "data.csv": {"url": server.url, "partial_validator": server.etag},
+    }))
+
+    fetch(server.url, dest, manifest_path=manifest)
+    assert server.requests[-1]["Range"] == f"bytes={half}-"
+    assert dest.read_bytes() == server.body
+
+
+def test_partial_of_an_outdated_version_restarts(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    dest.with_suffix(".tmp").write_bytes(b"stale bytes from v0")
+    manifest.write_text(json.dumps({
+        "data.csv": {"url": server.url, "partial_validator": '"v0"'},
+    }))
+
+    fetch(server.url, dest, manifest_path=manifest)
+    assert dest.read_bytes() == server.body
+
+
+def test_checksum_mismatch_discards_download(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    with pytest.raises(ChecksumMismatchError):
+        fetch(server.url, dest, expected_sha256="0" * 64, manifest_path=manifest)
+    assert not dest.exists()
+    assert not dest.with_suffix(".tmp").exists()
+
+
+def test_corrupted_copy_of_a_recorded_version_is_rejected(server, tmp_path):
+    dest, manifest = _paths(tmp_path)
+    fetch(server.url, dest, manifest_path=manifest)
+    dest.unlink()
+
+    server.body = server.body.replace(b"C-1,", b"C-X,")  # same ETag, different bytes
+    with pytest.raises(ChecksumMismatchError):
+        fetch(server.url, dest, manifest_path=manifest)
@@ -34,3 +34,134 @@ def test_missing_column_raises(raw_telco_df):
 def test_empty_dataframe_raises(raw_telco_df):
     with pytest.raises(ValueError):
         clean_telco_data(raw_telco_df.iloc[0:0])
+
+
+def test_streamed_chunks_match_one_shot_clean(raw_telco_df, tmp_path):
+    from src.ingest import load_clean_telco_data
+
+    path = tmp_path / "raw.csv"
+    raw_telco_df.to_csv(path, index=False)
+
+    streamed = load_clean_telco_data(path, chunksize=5)
+    one_shot = clean_telco_data(raw_telco_df)
+    pd.testing.assert_frame_equal(streamed, one_shot.reset_index(drop=True))
+
+
+def test_streamed_chunks_keep_categories_when_one_extends_a_domain(
+    raw_telco_df, tmp_path
+):
+    from src.ingest import load_clean_telco_data
+
+    raw = raw_telco_df.copy()
+    raw.loc[len(raw) - 1, "PaymentMethod"] = "Cryptocurrency"  # last chunk only
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+
+    streamed = load_clean_telco_data(path, chunksize=5)
+    assert isinstance(streamed["PaymentMethod"].dtype, pd.CategoricalDtype)
+    assert streamed["PaymentMethod"].cat.categories[-1] == "Cryptocurrency"
+    pd.testing.assert_frame_equal(streamed, clean_telco_data(raw))
+
+
+def _zero_padded_ids(raw_telco_df):
+    """Numeric-looking ids: a chunk of four is all digits, and '012' / '12'
+    only differ by a leading zero."""
+    raw = raw_telco_df.copy()
+    raw["customerID"] = ["0012", "0013", "0014", "0015", "012", "12"] + [
+        f"A-{i}" for i in range(7, len(raw) + 1)
+    ]
+    return raw
+
+
+def test_streamed_chunks_keep_zero_padded_ids(raw_telco_df, tmp_path):
+    from src.ingest import load_clean_telco_data
+
+    raw = _zero_padded_ids(raw_telco_df)
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+
+    streamed = load_clean_telco_data(path, chunksize=4)
+    assert streamed["customer_id"].tolist() == raw["customerID"].tolist()
+    pd.testing.assert_frame_equal(streamed, clean_telco_data(raw))
+
+
+def test_duplicate_customer_id_across_chunks_raises(raw_telco_df, tmp_path):
+    from src.ingest import DataValidationError, iter_clean_telco_chunks
+
+    dup = raw_telco_df.copy()
+    dup.loc[len(dup) - 1, "customerID"] = "A-1"  # lands in a later chunk
+    path = tmp_path / "raw.csv"
+    dup.to_csv(path, index=False)
+
+    with pytest.raises(DataValidationError, match="A-1"):
+        list(iter_clean_telco_chunks(path, chunksize=4))
+
+
+@pytest.mark.parametrize("column, values", [
+    ("customerID", ["A-1", "A-1"]),
+    ("tenure", [150, -3]),
+    ("MonthlyCharges", [0.0, -1.0]),
+    ("TotalCharges", ["-5", "10"]),
+    ("Contract", ["Weekly", "One year"]),
+    ("MonthlyCharges", [float("nan"), 10.0]),
+])
+def test_fast_validator_matches_pandera_messages(raw_telco_df, monkeypatch, column, values):
+    import pandera.errors
+
+    from src import ingest
+    from src.ingest import DataValidationError
+
+    bad = raw_telco_df.copy()
+    bad[column] = bad[column].astype(object)
+    bad.loc[:1, column] = values
+
+    monkeypatch.setattr(ingest, "VALIDATION_MODE", "strict")
+    with pytest.raises(pandera.errors.SchemaError) as strict:
+        clean_telco_data(bad)
+    monkeypatch.setattr(ingest, "VALIDATION_MODE", "fast")
+    with pytest.raises(DataValidationError) as fast:
+        clean_telco_data(bad)
+    assert str(fast.value) == str(strict.value)
+
+
+def test_fast_and_strict_modes_clean_identically(raw_telco_df, monkeypatch):
+    from src import ingest
+
+    monkeypatch.setattr(ingest, "VALIDATION_MODE", "strict")
+    strict = clean_telco_data(raw_telco_df)
+    monkeypatch.setattr(ingest, "VALIDATION_MODE", "fast")
+    pd.testing.assert_frame_equal(clean_telco_data(raw_telco_df), strict)
+
+
+def test_partitioned_ingest_merges_files(raw_telco_df, tmp_path):
+    from src.ingest import load_partitioned_telco_data
+
+    raw_telco_df.iloc[:5].to_csv(tmp_path / "day1.csv", index=False)
+    raw_telco_df.iloc[5:].to_csv(tmp_path / "day2.csv", index=False)
+
+    merged = load_partitioned_telco_data(tmp_path, max_workers=2)
+    pd.testing.assert_frame_equal(merged, clean_telco_data(raw_telco_df))
+
+    # a glob selects a subset of the drops
+    assert len(load_partitioned_telco_data(tmp_path / "day1*.csv")) == 5
+
+
+def test_partitioned_ingest_keeps_zero_padded_ids(raw_telco_df, tmp_path):
+    from src.ingest import load_partitioned_telco_data
+
+    raw = _zero_padded_ids(raw_telco_df)
+    raw.iloc[:4].to_csv(tmp_path / "day1.csv", index=False)  # all-digit ids
+    raw.iloc[4:].to_csv(tmp_path / "day2.csv", index=False)
+
+    merged = load_partitioned_telco_data(tmp_path, max_workers=1, chunksize=4)
+    pd.testing.assert_frame_equal(merged, clean_telco_data(raw))
+
+
+def test_partitioned_ingest_rejects_cross_partition_duplicates(raw_telco_df, tmp_path):
+    from src.ingest import DataValidationError, load_partitioned_telco_data
+
+    raw_telco_df.iloc[:5].to_csv(tmp_path / "east.csv", index=False)
+    raw_telco_df.iloc[3:].to_csv(tmp_path / "west.csv", index=False)  # A-4, A-5 overlap
+
+    with pytest.raises(DataValidationError, match="A-4"):
+        load_partitioned_telco_data(tmp_path, max_workers=2)
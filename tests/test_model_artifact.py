@@ -7,8 +7,13 @@ from src.models.train_logistic import (
     build_gbm_pipeline,
     build_pipeline,
     compare_models,
+    compile_model,
     feature_importances,
+    load_compiled_model,
     load_model,
+    load_or_compile_model,
+    predict_compiled,
+    save_compiled_model,
     save_model,
 )
 
@@ -39,6 +44,73 @@ def test_save_load_round_trip(fitted_pipeline, tmp_path):
     assert original == pytest.approx(restored)
 
 
+def test_compiled_model_matches_predict_proba(fitted_pipeline, tmp_path):
+    import numpy as np
+
+    from src.categories import compact_categoricals
+
+    pipeline, df = fitted_pipeline
+    expected = pipeline.predict_proba(df[FEATURES])[:, 1]
+    compiled = load_compiled_model(
+        save_compiled_model(compile_model(pipeline), tmp_path / "compiled.joblib")
+    )
+    # Object strings and shared-dictionary categories score identically.
+    for frame in (df, compact_categoricals(df)):
+        assert np.abs(predict_compiled(compiled, frame) - expected).max() < 1e-9
+
+
+def test_compiled_model_respects_each_frames_category_order(fitted_pipeline):
+    """Regression: equal-but-reordered unordered dtypes must not share a
+    cached lookup table (they number their codes differently)."""
+    import numpy as np
+    import pandas as pd
+
+    pipeline, df = fitted_pipeline
+    compiled = compile_model(pipeline)
+    expected = pipeline.predict_proba(df[FEATURES])[:, 1]
+    contracts = df["Contract"].astype(object)
+    for categories in (sorted(contracts.unique()), sorted(contracts.unique(), reverse=True)):
+        frame = df.assign(Contract=contracts.astype(pd.CategoricalDtype(categories)))
+        assert np.abs(predict_compiled(compiled, frame) - expected).max() < 1e-9
+
+
+def test_exported_compiled_model_is_used_unless_stale(fitted_pipeline, tmp_path):
+    import os
+
+    import numpy as np
+
+    pipeline, df = fitted_pipeline
+    model_path = save_model(pipeline, tmp_path / "model.joblib")
+    compiled_path = tmp_path / "compiled.joblib"
+    expected = predict_compiled(compile_model(pipeline), df)
+
+    # no export yet: compiled from the pipeline
+    compiled = load_or_compile_model(compiled_path, model_path)
+    assert np.array_equal(predict_compiled(compiled, df), expected)
+
+    # a fresh export is read as-is
+    exported = dict(compile_model(pipeline), intercept=0.0)
+    save_compiled_model(exported, compiled_path)
+    assert load_or_compile_model(compiled_path, model_path)["intercept"] == 0.0
+
+    # a pipeline retrained after the export wins
+    stamp = compiled_path.stat().st_mtime
+    os.utime(model_path, (stamp + 10, stamp + 10))
+    recompiled = load_or_compile_model(compiled_path, model_path)
+    assert np.array_equal(predict_compiled(recompiled, df), expected)
+
+
+def test_compiled_model_imputes_and_ignores_unknowns(fitted_pipeline):
+    import numpy as np
+
+    pipeline, df = fitted_pipeline
+    odd = df[FEATURES].astype({"PaymentMethod": object})
+    odd.loc[odd.index[:3], "TotalCharges"] = np.nan
+    odd.loc[odd.index[3:6], "PaymentMethod"] = "Cryptocurrency"
+    expected = pipeline.predict_proba(odd)[:, 1]
+    assert np.abs(predict_compiled(compile_model(pipeline), odd) - expected).max() < 1e-9
+
+
 def test_load_missing_model_raises(tmp_path):
     with pytest.raises(FileNotFoundError, match="src.pipeline"):
         load_model(tmp_path / "nope.joblib")
@@ -68,6 +140,38 @@ def test_compare_models_structure(raw_telco_df):
     assert result["brier_mean"].between(0, 1).all()
 
 
+def test_compare_models_matches_sequential_cross_validation():
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import StratifiedKFold, cross_validate
+
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 72, n).astype(float),
+        "MonthlyCharges": rng.uniform(20, 110, n),
+        "TotalCharges": rng.uniform(0, 8000, n),
+        **{c: rng.choice(["No", "Yes"], n) for c in FEATURES[3:]},
+    })
+    df.loc[::17, "TotalCharges"] = np.nan
+    df["churned"] = (rng.uniform(0, 1, n) < 0.2 + 0.4 * (df["Contract"] == "No")).astype(int)
+
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+    for max_workers in (1, 2):
+        result = compare_models(df, n_splits=3, max_workers=max_workers).set_index("model")
+        for name, pipe in [("Logistic Regression", build_pipeline()),
+                           ("Gradient Boosting", build_gbm_pipeline())]:
+            ref = cross_validate(pipe, df[FEATURES], df["churned"], cv=cv,
+                                 scoring=["roc_auc", "neg_brier_score", "accuracy"])
+            assert result.loc[name, "auc_mean"] == pytest.approx(ref["test_roc_auc"].mean())
+            assert result.loc[name, "brier_mean"] == pytest.approx(
+                -ref["test_neg_brier_score"].mean()
+            )
+            assert result.loc[name, "accuracy_mean"] == pytest.approx(
+                ref["test_accuracy"].mean()
+            )
+
+
 def test_feature_importances(fitted_pipeline):
     pipeline, _ = fitted_pipeline
     imp = feature_importances(pipeline, top_n=8)
@@ -1,11 +1,29 @@
 import numpy as np
 
 from src.survival import (
+    expected_remaining_by_group,
     expected_remaining_life,
     kaplan_meier,
+    kaplan_meier_by_group,
+    residual_life_table,
 )
 
 
+def _kaplan_meier_loop(durations, events):
+    """Reference O(n*T) estimator: one at-risk / death scan per unique time."""
+    durations = np.asarray(durations, dtype=float)
+    events = np.asarray(events, dtype=int)
+    times = np.unique(durations)
+    survival = np.empty(len(times))
+    s = 1.0
+    for i, t in enumerate(times):
+        at_risk = np.count_nonzero(durations >= t)
+        deaths = np.count_nonzero((durations == t) & (events == 1))
+        s *= 1.0 - deaths / at_risk
+        survival[i] = s
+    return times, survival
+
+
 def test_kaplan_meier_matches_hand_computation():
     # 5 customers: churn at t=1, censored at t=2, churn at t=3,
     # churn at t=4, censored at t=5.
@@ -30,6 +48,34 @@ def test_survival_is_non_increasing():
     assert np.all(np.diff(surv) <= 1e-9)
 
 
+def test_vectorized_kaplan_meier_identical_to_loop():
+    rng = np.random.default_rng(3)
+    for durations in (rng.integers(0, 72, 5000), rng.uniform(0, 72, 2000)):
+        events = rng.integers(0, 2, len(durations))
+        times, surv = kaplan_meier(durations, events)
+        ref_times, ref_surv = _kaplan_meier_loop(durations, events)
+        assert np.array_equal(times, ref_times)
+        assert np.array_equal(surv, ref_surv)
+
+
+def test_batched_kaplan_meier_matches_per_group_fits():
+    import pandas as pd
+
+    rng = np.random.default_rng(4)
+    n = 3000
+    groups = pd.Series(rng.choice(["Two year", "Month-to-month", "One year"], n))
+    durations = rng.integers(0, 72, n)
+    events = rng.integers(0, 2, n)
+
+    curves = kaplan_meier_by_group(groups.astype("category"), durations, events)
+    assert set(curves) == set(groups)
+    for label, (times, surv) in curves.items():
+        mask = (groups == label).to_numpy()
+        ref_times, ref_surv = kaplan_meier(durations[mask], events[mask])
+        assert np.array_equal(times, ref_times)
+        assert np.array_equal(surv, ref_surv)
+
+
 def test_cox_expected_remaining_individualizes_within_contract():
     """Cox uses all covariates, so two customers on the same contract but with
     different charges/services get different expected lifetimes — something the
@@ -78,3 +124,333 @@ def test_expected_remaining_life_bounded_and_higher_for_healthier_group():
     assert 0 <= rem_a <= 36
     assert 0 <= rem_b <= 36
     assert rem_b > rem_a  # the loyal group has more expected life ahead
+
+
+def test_residual_life_table_matches_direct_evaluation():
+    rng = np.random.default_rng(5)
+    times, surv = kaplan_meier(rng.integers(1, 50, 400), rng.integers(0, 2, 400))
+    table = residual_life_table(times, surv, max_tenure=70, forward_months=24)
+    direct = [expected_remaining_life(times, surv, a, 24) for a in range(71)]
+    assert np.allclose(table, direct, atol=1e-9)
+
+
+def test_expected_remaining_by_group_matches_per_customer_loop():
+    import pandas as pd
+
+    rng = np.random.default_rng(6)
+    n = 1500
+    df = pd.DataFrame({
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+        "tenure": rng.integers(0, 72, n),
+        "churned": rng.integers(0, 2, n),
+    })
+    rem = expected_remaining_by_group(df, "Contract", "tenure", "churned", 60)
+
+    for _, group in df.groupby("Contract"):
+        times, surv = kaplan_meier(group["tenure"], group["churned"])
+        direct = [expected_remaining_life(times, surv, t, 60) for t in group["tenure"]]
+        assert np.allclose(rem[group.index], direct, atol=1e-9)
+
+
+def test_chunked_cox_matches_dense_survival_matrix():
+    """The chunked gather/cumsum path reproduces lifelines' dense
+    predict_survival_function loop, whatever the chunk size."""
+    import warnings
+
+    import pandas as pd
+    from lifelines import CoxPHFitter
+
+    from src.survival import cox_expected_remaining
+
+    rng = np.random.default_rng(1)
+    n = 400
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 60, n),
+        "MonthlyCharges": rng.uniform(20, 110, n),
+        "Contract": rng.choice(["Month-to-month", "Two year"], n),
+    })
+    df["churned"] = (rng.uniform(0, 1, n) < 0.3).astype(int)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        rem = cox_expected_remaining(
+            df, ["MonthlyCharges"], ["Contract"], "tenure", "churned", 24, chunk_size=37,
+        )
+        X = pd.get_dummies(
+            df[["MonthlyCharges", "Contract"]], columns=["Contract"], drop_first=True
+        ).astype(float)
+        cph = CoxPHFitter(penalizer=0.1).fit(
+            X.assign(tenure=df["tenure"], churned=df["churned"]), "tenure", "churned"
+        )
+    max_t = int(df["tenure"].max()) + 24
+    sf = cph.predict_survival_function(X, times=np.arange(max_t + 1)).to_numpy()
+    dense = [
+        (sf[t + 1:t + 25, j] / sf[t, j]).sum() for j, t in enumerate(df["tenure"])
+    ]
+    assert np.allclose(rem, dense, atol=1e-9)
+
+
+def test_cox_artifact_scores_like_refit_and_round_trips(tmp_path):
+    """A persisted artifact, scored in numpy, reproduces the fitted model."""
+    import warnings
+
+    import pandas as pd
+
+    from src.survival import (
+        cox_expected_remaining,
+        fit_cox_artifact,
+        load_cox_artifact,
+        save_cox_artifact,
+        score_cox_artifact,
+    )
+
+    rng = np.random.default_rng(2)
+    n = 400
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 60, n),
+        "MonthlyCharges": rng.uniform(20, 110, n),
+        "Contract": pd.Categorical(
+            rng.choice(["Month-to-month", "Two year"], n),
+            categories=["Month-to-month", "One year", "Two year"],
+        ),
+    })
+    df["churned"] = (rng.uniform(0, 1, n) < 0.3).astype(int)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = cox_expected_remaining(
+            df, ["MonthlyCharges"], ["Contract"], "tenure", "churned", 24
+        )
+        artifact = fit_cox_artifact(df, ["MonthlyCharges"], ["Contract"], "tenure", "churned")
+    assert artifact["dummy_columns"] == [("Contract", "Two year")]
+
+    path = save_cox_artifact(artifact, tmp_path / "cox.joblib")
+    loaded = load_cox_artifact(path)
+    assert np.allclose(score_cox_artifact(loaded, df, "tenure", 24), expected, atol=1e-9)
+
+    # new customers are scored without refitting
+    new = df.head(5).assign(tenure=[70, 3, 0, 12, 40])
+    rem = score_cox_artifact(loaded, new, "tenure", 24)
+    assert rem.shape == (5,) and np.isfinite(rem).all() and (rem <= 24).all()
+
+
+def test_pattern_dedup_is_exact_and_binning_collapses_patterns():
+    """Duplicated covariate vectors share one curve without changing results;
+    binned numerics yield fewer patterns at a small precision cost."""
+    import warnings
+
+    import pandas as pd
+
+    from src.survival import (
+        covariate_patterns,
+        cox_design_matrix,
+        fit_cox_artifact,
+        score_cox_artifact,
+    )
+
+    rng = np.random.default_rng(3)
+    n = 300
+    base = pd.DataFrame({
+        "tenure": rng.integers(0, 60, n),
+        "MonthlyCharges": rng.uniform(20, 110, n).round(2),
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+    })
+    base["churned"] = (rng.uniform(0, 1, n) < 0.3).astype(int)
+    df = pd.concat([base] * 5, ignore_index=True)
+    df["tenure"] = rng.integers(0, 60, len(df))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        artifact = fit_cox_artifact(df, ["MonthlyCharges"], ["Contract"], "tenure", "churned")
+
+    patterns, pair_pattern, pair_tenure, inverse = covariate_patterns(
+        cox_design_matrix(df, artifact), df["tenure"]
+    )
+    assert len(patterns) == len(base.drop_duplicates(["MonthlyCharges", "Contract"]))
+    assert np.all(np.diff(pair_pattern) >= 0)
+    assert np.array_equal(pair_tenure[inverse], df["tenure"].to_numpy())
+
+    exact = score_cox_artifact(artifact, df, "tenure", 24, dedup=False)
+    deduped = score_cox_artifact(artifact, df, "tenure", 24, chunk_size=7)
+    assert np.array_equal(deduped, exact)
+
+    binned = score_cox_artifact(artifact, df, "tenure", 24, numeric_bins={"MonthlyCharges": 5.0})
+    assert np.abs(binned - exact).max() < 0.5
+
+
+def test_missing_covariate_is_its_own_pattern():
+    """A NaN covariate must not alias another row's pattern: the row scores
+    as it does without dedup, and the other customers are untouched."""
+    import warnings
+
+    import pandas as pd
+
+    from src.survival import (
+        _factorize_rows,
+        covariate_patterns,
+        cox_design_matrix,
+        fit_cox_artifact,
+        score_cox_artifact,
+    )
+
+    ids, n_ids = _factorize_rows([np.array([0.0, 1.0, 0.0]), np.array([5.0, np.nan, 2.0])])
+    assert n_ids == 3 and len(set(ids)) == 3
+
+    rng = np.random.default_rng(4)
+    n = 200
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 60, n),
+        "MonthlyCharges": rng.choice([30.0, 70.0], n),
+        "SupportCalls": rng.choice([0.0, 1.0], n),
+    })
+    df["churned"] = (rng.uniform(0, 1, n) < 0.3).astype(int)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        artifact = fit_cox_artifact(
+            df, ["MonthlyCharges", "SupportCalls"], [], "tenure", "churned"
+        )
+
+    # NaN on a row of the second-seen charge: with the -1 sentinel its id
+    # collided with (first-seen charge, second-seen call count).
+    clean = score_cox_artifact(artifact, df, "tenure", 24)
+    missing = df.copy()
+    row = int(np.flatnonzero(df["MonthlyCharges"] != df["MonthlyCharges"].iloc[0])[0])
+    missing.loc[row, "SupportCalls"] = np.nan
+    patterns, *_ = covariate_patterns(
+        cox_design_matrix(missing, artifact), missing["tenure"]
+    )
+    assert len(patterns) == 5
+    exact = score_cox_artifact(artifact, missing, "tenure", 24, dedup=False)
+    deduped = score_cox_artifact(artifact, missing, "tenure", 24)
+    assert np.array_equal(deduped, exact)
+    others = np.arange(n) != row
+    assert np.array_equal(deduped[others], clean[others])
+
+
+def test_native_cox_fit_matches_lifelines():
+    """The numpy Newton-Raphson fit reproduces lifelines (Efron ties, L2
+    penalty, Breslow baseline) on heavily tied integer tenures."""
+    import warnings
+
+    import pandas as pd
+
+    from src.survival import fit_cox_artifact, score_cox_artifact
+
+    rng = np.random.default_rng(5)
+    n = 800
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 40, n),
+        "MonthlyCharges": rng.uniform(20, 110, n),
+        "TotalCharges": rng.uniform(50, 6000, n),
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+    })
+    p = 0.15 + 0.3 * (df["Contract"] == "Month-to-month")
+    df["churned"] = (rng.uniform(0, 1, n) < p).astype(int)
+
+    args = (df, ["MonthlyCharges", "TotalCharges"], ["Contract"], "tenure", "churned")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ref = fit_cox_artifact(*args, fitter="lifelines")
+    native = fit_cox_artifact(*args, fitter="native")
+
+    assert np.allclose(native["params"], ref["params"], rtol=1e-6, atol=1e-9)
+    assert np.array_equal(native["baseline_times"], ref["baseline_times"])
+    assert np.allclose(native["baseline_cumhaz"], ref["baseline_cumhaz"], rtol=1e-6)
+    assert np.allclose(
+        score_cox_artifact(native, df, "tenure", 24),
+        score_cox_artifact(ref, df, "tenure", 24),
+        atol=1e-6,
+    )
+
+
+def test_breslow_and_efron_agree_without_ties():
+    import pytest
+
+    from src.survival import cox_ph_fit
+
+    rng = np.random.default_rng(6)
+    X = rng.normal(size=(300, 3))
+    durations = rng.exponential(np.exp(-X @ [0.5, -0.3, 0.0]))
+    events = rng.uniform(size=300) < 0.7
+
+    efron = cox_ph_fit(X, durations, events, penalizer=0.01)
+    breslow = cox_ph_fit(X, durations, events, penalizer=0.01, ties="breslow")
+    assert np.allclose(efron["params"], breslow["params"])
+    assert efron["params"][0] > 0 > efron["params"][1]
+
+    with pytest.raises(ValueError, match="ties"):
+        cox_ph_fit(X, durations, events, ties="exact")
+
+
+def test_online_kaplan_meier_matches_batch_fit_and_persists(tmp_path):
+    import pandas as pd
+    import pytest
+
+    from src.survival import OnlineKaplanMeier
+
+    rng = np.random.default_rng(7)
+    n = 500
+    df = pd.DataFrame({
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+        "tenure": rng.integers(0, 72, n),
+        "churned": (rng.uniform(size=n) < 0.3).astype(int),
+    })
+    history, stream = df.iloc[:400], df.iloc[400:]
+
+    km = OnlineKaplanMeier.from_frame(history, "Contract", "tenure", "churned")
+    for row in stream.itertuples():  # one event at a time, as from the daily feed
+        if row.churned:
+            km.add_events(row.Contract, row.tenure)
+        else:
+            km.add_censored(row.Contract, row.tenure)
+
+    batch = kaplan_meier_by_group(df["Contract"], df["tenure"], df["churned"])
+    for group, (times, survival) in batch.items():
+        online_times, online_survival = km.curve(group)
+        assert np.array_equal(online_times, times)
+        assert np.array_equal(online_survival, survival)
+
+    expected = expected_remaining_by_group(df, "Contract", "tenure", "churned", 24)
+    assert np.allclose(km.expected_remaining(df["Contract"], df["tenure"], 24), expected)
+
+    # a censored customer churns a month later: retract, then record the event
+    i = df.index[df["churned"] == 0][0]
+    group, tenure = df.at[i, "Contract"], df.at[i, "tenure"]
+    km.add_censored(group, tenure, count=-1)
+    km.add_events(group, tenure + 1)
+    df.loc[i, ["tenure", "churned"]] = [tenure + 1, 1]
+    times, survival = kaplan_meier_by_group(df["Contract"], df["tenure"], df["churned"])[group]
+    assert np.array_equal(km.curve(group)[1], survival)
+
+    restored = OnlineKaplanMeier.load(km.save(tmp_path / "km.joblib"))
+    for group in km.groups:
+        assert np.array_equal(restored.curve(group)[1], km.curve(group)[1])
+
+    with pytest.raises(ValueError, match="integer"):
+        km.add_events("Two year", 3.5)
+    with pytest.raises(ValueError, match="Retracting"):
+        km.add_censored("Two year", 71, count=-10_000)
+
+
+def test_newton_line_search_never_accepts_a_worse_step():
+    """When no halving improves the likelihood the fit keeps the previous
+    point: it stops if the predicted gain is rounding noise, else raises."""
+    import pytest
+
+    from src.survival import CoxConvergenceError, _newton_maximize
+
+    calls = []
+
+    def misleading(theta):  # claims ascent along +x, but every move is worse
+        calls.append(theta.copy())
+        return -10.0 - abs(theta[0]), np.array([1.0]), np.array([[-1.0]])
+
+    with pytest.raises(CoxConvergenceError, match="no ascent step"):
+        _newton_maximize(misleading, np.zeros(1), 50, 1e-9, CoxConvergenceError, "Cox fit")
+    assert len(calls) > 2 and (np.abs(np.concatenate(calls[1:])) > 0).all()
+
+    def flat(theta):  # at the optimum to rounding: the tiny step cannot help
+        return -10.0 - 1e6 * abs(theta[0]), np.array([1e-12]), np.array([[-1e-3]])
+
+    theta, loglik = _newton_maximize(flat, np.zeros(1), 50, 1e-12, CoxConvergenceError, "Cox fit")
+    assert theta[0] == 0.0 and loglik == -10.0
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.config import OUTREACH_COST
+from src.decision.retention_strategy import (
+    apply_decision_strategy,
+    build_retention_scores,
+    select_customers_under_budget,
+)
+from src.decision.what_if import offer_grid, what_if_grid
+from src.economics import offer_cost
+
+
+@pytest.fixture
+def offer_scored(scored_df):
+    rng = np.random.default_rng(1)
+    return scored_df.assign(
+        Contract=rng.choice(list(OUTREACH_COST), len(scored_df)),
+        MonthlyCharges=rng.uniform(20, 110, len(scored_df)),
+    )
+
+
+def test_offer_grid_is_the_full_product():
+    grid = offer_grid((0.1, 0.3), (1, 3, 6), [OUTREACH_COST, {"Month-to-month": 5.0}])
+    assert len(grid) == 12
+    assert {"discount_rate", "offer_months", "outreach_Two year"} <= set(grid.columns)
+    assert grid["outreach_Two year"].isna().sum() == 6
+
+
+@pytest.mark.parametrize("strategy", ["Conservative", "Balanced", "Aggressive"])
+def test_grid_matches_the_decision_engine_per_point(offer_scored, strategy):
+    grid = offer_grid(
+        (0.1, 0.3, 0.6), (1, 3, 12),
+        [{k: s * v for k, v in OUTREACH_COST.items()} for s in (0.5, 2.0)],
+    )
+    table = what_if_grid(offer_scored, grid, budget=800, max_customers=8,
+                         strategy=strategy, save_rate=0.5)
+
+    for _, point in table.iterrows():
+        outreach = {c: point[f"outreach_{c}"] for c in OUTREACH_COST}
+        df = offer_scored.assign(retention_cost=offer_cost(
+            offer_scored, outreach, point["discount_rate"], point["offer_months"]
+        ))
+        ranked = apply_decision_strategy(build_retention_scores(df, 0.5), strategy)
+        selected, spent = select_customers_under_budget(ranked, 800, 8)
+        assert point["act_customers"] == len(selected)
+        assert point["act_cost"] == pytest.approx(spent)
+        assert point["act_value"] == pytest.approx(selected["net_retention_value"].sum())
+        assert point["mean_retention_cost"] == pytest.approx(df["retention_cost"].mean())
+        assert point["positive_value_customers"] == (ranked["net_retention_value"] > 0).sum()
+
+
+def test_cheaper_offers_never_fund_less_value(offer_scored):
+    grid = offer_grid(discount_rates=(0.1, 0.2, 0.4, 0.8))
+    table = what_if_grid(offer_scored, grid, budget=1e9)
+    assert table["act_value"].is_monotonic_decreasing
+    assert (table["act_customers"] == table["positive_value_customers"]).all()
+
+
+def test_unknown_strategy_rejected(offer_scored):
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        what_if_grid(offer_scored, offer_grid(), budget=100, strategy="reckless")